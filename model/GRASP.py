@@ -2,11 +2,34 @@ from gurobipy import *
 from utils.utils import *
 from utils.solution_utils import *
 from utils.initial_values import *
+from model.options import create_options
+from model.evaluation import create_evaluator, evaluate_fleets, fleet_key, best_index, close_evaluator, print_evaluations
 import time
+import numpy as np
 
-def GRASP(model, sets, params, vars, start_time):
+def GRASP(model, sets, params, vars, start_time, options=None):
     """
     Developed by: Ivana Versluijs, 2023
+    The fleets (solution vectors) are evaluated by model.evaluation, in parallel with the option 'evaluation_workers'.
+    Neighbours start from the solution of the current fleet and are abandoned once they cannot beat the best
+    neighbour of the iteration (options 'evaluation_warm_start' and 'evaluation_cutoff'), optionally after a
+    screening by a lower bound (option 'evaluation_screening').
+    The construction sets the vessel counts by marginal analysis or bisection (option 'construction'), greedy or
+    from a randomized restricted candidate list (option 'construction_alpha')
+    """
+    if options is None:
+        options = create_options()
+    evaluator = create_evaluator(model, sets, params, vars, options)
+    try:
+        return search(model, sets, params, vars, start_time, evaluator, options)
+    finally:
+        close_evaluator(evaluator)
+        print_evaluations(evaluator)
+
+
+def search(model, sets, params, vars, start_time, evaluator, options):
+    """
+    Greedy construction and tabu search of GRASP(), evaluating the fleets with the evaluator
     """
     (bases, vessels, periods, charter_dict, charter_periods, tasks, vessel_task_compatibility,
      prev_tasks, corr_tasks, planned_prev_tasks, planned_corr_tasks, bundle_dict, bundles, spare_parts,
@@ -22,78 +45,117 @@ def GRASP(model, sets, params, vars, start_time):
      tasks_in_bundles, technicians_required_bundle, weather_max_time_offshore,
      order_cost, lead_time, holding_cost, parts_required, max_part_capacity,
      reorder_level, big_m, max_capacity_for_docking,
-     additional_time, tech_standby_cost, initial_inventory) = unpack_parameters(params)
+     additional_time, tech_standby_cost, initial_inventory, feasible_bundles,
+     charter_period_of, corrective_failures, cumulative_corrective_failures, store) = unpack_parameters(params)
 
     (base_use, purchased_vessels, chartered_vessels, task_performed,
      bundle_performed, tasks_late, tasks_not_performed,
      periods_late, hours_spent, inventory_level, order_quantity,
      order_trigger, mv_offshore, lambda_P, lambda_CH, mu_P, mu_CH) = unpack_variables(vars)
 
+    # Positions in the fleet vector (solution), see utils.solution_utils.flatten_decision_vars
+    def purchased_index(b, v):
+        return bases.index(b)*len(vessels) + vessels.index(v)
+
+    def chartered_index(b, v, p):
+        return len(purchased_vessels) + bases.index(b)*len(vessels)*len(charter_periods) + vessels.index(v)*len(charter_periods) + p-1
+
+    def base_index(b):
+        return len(purchased_vessels) + len(chartered_vessels) + bases.index(b)
+
+    construction = options['construction']
+    alpha = options['construction_alpha']
+    rng = np.random.default_rng(options['construction_seed'])
+    tolerance = evaluator['tolerance']
+
+    def evaluate_values(fleet, i, values):
+        # Objectives of the fleet with position i set to each value
+        candidates = []
+        for value in values:
+            candidate = fleet.copy()
+            candidate[i] = value
+            candidates.append(candidate)
+        return [result['objective'] for result in evaluate_fleets(evaluator, candidates)]
+
+    def improves(objectives, value, previous):
+        # The objective of value is better than the one of previous (beyond the MIP gap, see best_index()), or
+        # both are infeasible (more vessels needed)
+        if objectives[previous] == float('inf'):
+            return True
+        return best_index([objectives[previous], objectives[value]], tolerance) == 1
+
+    def select(candidates, objectives):
+        # Best candidate (alpha 0), or a random one of the restricted candidate list: the candidates within
+        # alpha times the range of the finite objectives from the best
+        best = min(objectives)
+        if alpha == 0 or best == float('inf'):
+            return candidates[best_index(objectives, tolerance)]
+        worst = max(objective for objective in objectives if objective < float('inf'))
+        rcl = [c for c, objective in zip(candidates, objectives) if objective <= best + alpha * (worst - best)]
+        return rcl[rng.integers(len(rcl))]
+
+    def choose(fleet, i, values):
+        # Set position i of the fleet to one of the values (ascending), the cost is (near) convex in the number
+        # of vessels: 'marginal' adds vessels until one more does not improve (in batches of one value per
+        # worker), 'bisection' searches the first value where one more does not improve, 'enumerate' all values
+        objectives = {}
+        if construction == 'enumerate':
+            objectives.update(zip(values, evaluate_values(fleet, i, values)))
+        elif construction == 'marginal':
+            for first in range(0, len(values), evaluator['workers']):
+                batch = values[first:first + evaluator['workers']]
+                objectives.update(zip(batch, evaluate_values(fleet, i, batch)))
+                evaluated = values[:first + len(batch)]
+                if any(not improves(objectives, value, previous) for previous, value in zip(evaluated, evaluated[1:])):
+                    break
+        else:
+            low, high = 0, len(values) - 1
+            while low < high:
+                middle = (low + high) // 2
+                pair = [value for value in values[middle:middle + 2] if value not in objectives]
+                objectives.update(zip(pair, evaluate_values(fleet, i, pair)))
+                if improves(objectives, values[middle + 1], values[middle]):
+                    low = middle + 1
+                else:
+                    high = middle
+            if values[low] not in objectives:
+                objectives[values[low]] = evaluate_values(fleet, i, [values[low]])[0]
+        evaluated = sorted(objectives)
+        fleet[i] = select(evaluated, [objectives[value] for value in evaluated])
+
     # ========== Greedy Construction Algorithm ==========
+    construction_solves = evaluator['evaluations']
+
     # --- 1. --- Set all bases and vessels to zero
-    for b in bases:
-        base_use[b].ub = 0
-        for v in vessels:
-            purchased_vessels[b, v].ub = 0
-            for p in charter_periods:
-                chartered_vessels[b, v, p].ub = 0
+    fleet = [0] * (len(purchased_vessels) + len(chartered_vessels) + len(base_use))
 
     # --- 2. --- Choose optimal (cheapest) base
-    obj_value_b = {}
-    for b in bases:
-        obj_value_b[b] = float('inf')
-        base_use[b].lb = 1
-        base_use[b].ub = 1
-        model.optimize()
-        if model.status == GRB.Status.OPTIMAL:
-            obj_value_b[b] = model.objVal
-
-        #Turn off the base again
-        base_use[b].lb = 0
-        base_use[b].ub = 0
-
+    candidates = []
     for b in bases:
-        base_use[b].lb = 0
-        base_use[b].ub = 0
-    base_use[min(obj_value_b, key=obj_value_b.get)].lb = 1
-    base_use[min(obj_value_b, key=obj_value_b.get)].ub = 1
-
-    b_opt = min(obj_value_b, key=obj_value_b.get)
+        candidate = fleet.copy()
+        candidate[base_index(b)] = 1
+        candidates.append(candidate)
+    objectives = [result['objective'] for result in evaluate_fleets(evaluator, candidates)]
+    b_opt = select(bases, objectives)
+    fleet[base_index(b_opt)] = 1
 
     # --- 3. --- Choose optimal puchased vessels quantity per type
-    obj_value_pv = {}
     for v in vessels:
-        obj_value_pv[v] = {}
-        for i in range(min(max_vessels_available_charter[v], capacity_base_for_vessels[b_opt, v]) + 1):
-            obj_value_pv[v][i] = float('inf')
-            purchased_vessels[b_opt, v].ub = i
-            purchased_vessels[b_opt, v].lb = i
-            model.optimize()
-            if model.status == GRB.Status.OPTIMAL:
-                obj_value_pv[v][i] = model.objVal
-
-        purchased_vessels[b_opt, v].ub = min(obj_value_pv[v], key=obj_value_pv[v].get)
-        purchased_vessels[b_opt, v].lb = min(obj_value_pv[v], key=obj_value_pv[v].get)
+        choose(fleet, purchased_index(b_opt, v), list(range(min(max_vessels_available_charter[v], capacity_base_for_vessels[b_opt, v]) + 1)))
 
     # --- 4. --- Choose optimal chartered vessels quantity per type
-    obj_value_cv = {}
     for v in vessels:
-        obj_value_cv[v] = {}
         for p in charter_periods:
-            obj_value_cv[v][p] = {}
-            for i in range(min(max_vessels_available_charter[v], capacity_base_for_vessels[b_opt, v])+1-min(obj_value_pv[v], key=obj_value_pv[v].get)):
-                obj_value_cv[v][p][i] = float('inf')
-                chartered_vessels[b_opt, v, p].ub = i
-                chartered_vessels[b_opt, v, p].lb = i
-                model.optimize()
-                if model.status == GRB.Status.OPTIMAL:
-                    obj_value_cv[v][p][i] = model.objVal
-            chartered_vessels[b_opt,v,p].ub = min(obj_value_cv[v][p], key=obj_value_cv[v][p].get)
-            chartered_vessels[b_opt,v,p].lb = min(obj_value_cv[v][p], key=obj_value_cv[v][p].get)
+            values = list(range(min(max_vessels_available_charter[v], capacity_base_for_vessels[b_opt, v])+1-fleet[purchased_index(b_opt, v)]))
+            if values:
+                choose(fleet, chartered_index(b_opt, v, p), values)
+    print(f"Construction ({construction}): {evaluator['evaluations'] - construction_solves} fleets solved")
 
     # --- 5. --- Optimize for initial solution (starting point)
+    fix_fleet(model, vars, fleet)
     model.optimize()
     if model.status == GRB.Status.INFEASIBLE:
+        restore_constraint_names(model)
         model.computeIIS()
         model.write("infeasible.ilp")
         print("Model is infeasible. IIS written to 'infeasible.ilp'.")
@@ -135,6 +197,8 @@ def GRASP(model, sets, params, vars, start_time):
     objective[iteration] = model.objVal
     best_objective_so_far = []
     it_objectives[iteration] = [model.objVal]
+    # Current solution with its values of all variables, the MIP start of its neighbours
+    parent = (solution[iteration], {'solution': np.array(model.getAttr(GRB.Attr.X, model.getVars()))})
 
     iteration = 1           # start of the iterations
     max_it = 15             # maximum number of iterations
@@ -266,43 +330,32 @@ def GRASP(model, sets, params, vars, start_time):
                         neighbours.append(nb.copy())
                         it_move.append('switch '+str(b)+bases[l])
 
-        # Delete neighbours that have already been considered
-        existing = []
-        for o in range(len(neighbours)):
-            for i in solution:
-                if neighbours[o] == solution[i]:
-                    existing.append(neighbours[o])
-        for i in range(len(existing)):
-            if existing[i] in neighbours:
-                neighbours.remove(existing[i])
-
-
-        # Calculate objective values for neighbours
-        it_objectives[iteration] = []
-        for x in neighbours:
-            for b in bases:
-                l = len(purchased_vessels) + len(chartered_vessels) + bases.index(b)
-                base_use[b].lb = x[l]
-                base_use[b].ub = x[l]
-                for v in vessels:
-                    i = bases.index(b)*len(vessels) + vessels.index(v)
-                    purchased_vessels[b, v].lb = x[i]
-                    purchased_vessels[b, v].ub = x[i]
-                    for p in range(1, len(charter_periods)+1):
-                        j = bases.index(b)*len(vessels)*len(charter_periods) + vessels.index(v)*len(charter_periods) + p-1 + len(purchased_vessels)
-                        chartered_vessels[b, v, p].lb = x[j]
-                        chartered_vessels[b, v, p].ub = x[j]
-            model.optimize()
-            if model.status == GRB.Status.OPTIMAL:
-                it_objectives[iteration].append(model.objVal)
-            else:
-                it_objectives[iteration].append(float('inf'))
-
-        solution[iteration] = neighbours[it_objectives[iteration].index(min(it_objectives[iteration]))]
-        objective[iteration] = min(it_objectives[iteration])
+        # Delete neighbours that have already been accepted as solution (with their moves). Neighbours that were
+        # evaluated before but not accepted stay, their results come from the cache of the evaluator
+        accepted = {fleet_key(solution[i]) for i in solution}
+        kept = [o for o in range(len(neighbours)) if fleet_key(neighbours[o]) not in accepted]
+        neighbours = [neighbours[o] for o in kept]
+        it_move = [it_move[o] for o in kept]
+
+
+        # Calculate objective values for neighbours (in parallel with workers, see model.evaluation), starting
+        # from the current solution. Dominated neighbours cannot beat the best one and have objective inf, as
+        # have the neighbours the screening saved a full solve of
+        saved = evaluator['saved']
+        results = evaluate_fleets(evaluator, neighbours, parent, cutoff=True, screen=True)
+        it_objectives[iteration] = [result['objective'] for result in results]
+        chosen = best_index(it_objectives[iteration], evaluator['tolerance'])
+        saved = evaluator['saved'] - saved
+        dominated = sum(result['status'] == GRB.CUTOFF and not result.get('screened', False) for result in results)
+        print(f'Iteration {iteration}: {len(neighbours)} neighbours, {dominated} dominated, '
+              f'{saved} full solves saved by the screening')
+
+        solution[iteration] = neighbours[chosen]
+        parent = (neighbours[chosen], results[chosen])
+        objective[iteration] = it_objectives[iteration][chosen]
         best_objective_so_far.append(min(objective[o] for o in range(iteration)))
 
-        tabu_addition = it_move[it_objectives[iteration].index(min(it_objectives[iteration]))]
+        tabu_addition = it_move[chosen]
         tabu.append(tabu_addition)
 
         # stopping criteria if no improvements in objective value have been found
@@ -317,17 +370,5 @@ def GRASP(model, sets, params, vars, start_time):
     print('Final solution:', final_solution)
 
     # --- 7. --- Set the final solution and optimize the model
-    for b in bases:
-        l = len(purchased_vessels) + len(chartered_vessels) + bases.index(b)
-        base_use[b].lb = final_solution[l]
-        base_use[b].ub = final_solution[l]
-        for v in vessels:
-            i = bases.index(b)*len(vessels) + vessels.index(v)
-            purchased_vessels[b, v].lb = final_solution[i]
-            purchased_vessels[b, v].ub = final_solution[i]
-            for p in range(1, len(charter_periods)+1):
-                j = bases.index(b)*len(vessels)*len(charter_periods) + vessels.index(v) * len(charter_periods) + p-1 + len(purchased_vessels)
-                chartered_vessels[b, v, p].lb = final_solution[j]
-                chartered_vessels[b, v, p].ub = final_solution[j]
-
+    fix_fleet(model, vars, final_solution)
     model.optimize()
@@ -0,0 +1,77 @@
+import numpy as np
+from model.parameter_store import positions
+
+
+def indicator_big_m(sets, params):
+    """
+    Smallest big-M of the linearized indicator constraints 17 and 34 - 37 (option 'indicator_formulation'),
+    derived from the part capacities
+    - 17a/17c: an unused base has no vessels (constraint 1), so no tasks or mothervessel parts, and no inventory
+      (17b). Its order quantity is at most its part capacity (26a, 28a), so the balance differs from 0 by at most
+      the part capacity, plus the initial inventory in the first period
+    - 17b: the inventory level of a base is at most its part capacity (21)
+    - 34/35: the order quantity of a mothervessel is at most its part capacity (26b, 28b)
+    - 36/37: the inventory level of a base is at most its part capacity (21)
+    :param sets: Sets
+    :param params: Parameters
+    :return: Dict with the big-M arrays '17a' (spare_parts, bases, periods), '17b' (spare_parts, bases),
+             '34' (spare_parts, mother_vessels) and '36' (spare_parts, bases)
+    """
+    store = params['store']
+    index = store['index']
+    base_location = positions(index, 'locations', sets['bases'])
+    mv_location = positions(index, 'locations', sets['mother_vessels'])
+    capacity = store['max_part_capacity']
+    initial = np.array([int(i) for i in store['initial_inventory']], dtype=np.int64)
+
+    balance = np.repeat(capacity[:, base_location, None], len(sets['periods']), axis=2)
+    balance[:, :, 0] += initial[base_location]
+
+    return {
+        '17a': balance,
+        '17b': capacity[:, base_location],
+        '34': capacity[:, mv_location],
+        '36': capacity[:, base_location],
+    }
+
+
+def constraint_big_m(sets, params, tightening='tight'):
+    """
+    Big-M of the constraints 19, 22 - 28, 38 and 39 (option 'big_m')
+    'global' uses params['big_m'] in every row (original). 'tight' uses the smallest M for which the row still
+    holds in every solution, from 0 <= inventory_level <= max_part_capacity (21) and the constraints below
+    - 19, 28, 38, 39: an order quantity is at most the part capacity (26 with an order trigger, 28 without) and
+      so is the inventory level. A mothervessel type is used at most once (30)
+    - 22/23: without an order trigger the inventory level is at most the part capacity, above the reorder level
+    - 23b: an unused base has no inventory (17b), the base_use term of 23
+    - 24/25: with an order trigger the inventory level is at least 0, so at most reorder level + 1 below the
+      row. 25b: the same for an unused base, the base_use term of 25
+    - 26: without an order trigger the order quantity is 0 (28) and the inventory level at most the part
+      capacity, so the row holds without its big-M term
+    - 27: without an order trigger the row has to allow capacity - inventory level <= 0, at most the capacity
+    :param sets: Sets
+    :param params: Parameters
+    :param tightening: 'tight' or 'global'
+    :return: Dict with the big-M of each constraint as an array (spare_parts, locations)
+    """
+    store = params['store']
+    capacity = store['max_part_capacity']
+    reorder = store['reorder_level']
+    if tightening == 'global':
+        return {c: np.full(capacity.shape, store['big_m']) for c in
+                ['19', '22', '23', '23b', '24', '25', '25b', '26', '27', '28', '38', '39']}
+
+    return {
+        '19': capacity,
+        '22': np.maximum(capacity - reorder, 0),
+        '23': np.maximum(capacity - reorder, 0),
+        '23b': np.maximum(-reorder, 0),
+        '24': np.maximum(reorder + 1, 0),
+        '25': np.maximum(reorder + 1, 0),
+        '25b': np.maximum(reorder + 1, 0),
+        '26': np.zeros(capacity.shape),
+        '27': capacity,
+        '28': capacity,
+        '38': capacity,
+        '39': capacity,
+    }
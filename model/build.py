@@ -0,0 +1,39 @@
+from gurobipy import *
+from model.variables import create_variables
+from model.constraints import add_constraints
+from model.matrix_constraints import add_matrix_constraints
+from model.objective import add_objective_function
+from model.options import create_options
+from model.reduction import find_reductions, apply_reductions, print_reductions
+
+
+def build_model(sets, params, options=None, name="de Gooijer, 2025"):
+    """
+    Build the model: variables, constraints and objective function
+    :param sets: Sets
+    :param params: Parameters
+    :param options: Model options, see model.options
+    :param name: Name of the Gurobi model
+    :return: Gurobi model and the variables dictionary
+    """
+    if options is None:
+        options = create_options()
+
+    # Bundles removed by the reduction are never created, the parameters are only changed for this model
+    if options['reduce_model']:
+        reductions = find_reductions(sets, params, options)
+        params = dict(params, feasible_bundles=reductions['feasible_bundles'])
+
+    model = Model(name)
+    vars = create_variables(model, sets, params, options)
+    model.update()
+    if options['reduce_model']:
+        apply_reductions(model, vars, reductions)
+        print_reductions(reductions)
+    if options['constraint_builder'] == 'matrix':
+        add_matrix_constraints(model, sets, params, vars, options)
+    else:
+        add_constraints(model, sets, params, vars, options)
+    add_objective_function(model, sets, params, vars, options)
+
+    return model, vars
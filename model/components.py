@@ -0,0 +1,33 @@
+from model.options import create_options
+
+# Components of the model, each with its own variables, constraints and objective terms
+# - 'core': fleet composition and maintenance dispatch. Variables base_use to hours_spent (and carry_over_hours),
+#   constraints 1 - 16, the costs of bases, vessels, operations, downtime and penalties
+# - 'inventory': spare parts inventory at the bases and mothervessels. Variables inventory_level, order_quantity,
+#   order_trigger, lambda_P/CH and mu_P/CH, constraints 17 - 28 and 34 - 39, the holding and order costs
+# - 'mother_vessels': mothervessels as offshore locations. Variable mv_offshore, constraints 29 - 33, the
+#   mothervessel operating costs
+COMPONENTS = ['core', 'inventory', 'mother_vessels']
+
+
+def model_components(sets, options=None):
+    """
+    Components included in the model, only the extensions the scenario needs
+    The inventory extension is included when the scenario has spare parts and the option 'inventory_extension'
+    is set. The mothervessel extension is included when the sets have mothervessels, the option
+    'mothervessel_extension' leaves them out of the sets, see model.sets.create_sets().
+    :param sets: Sets
+    :param options: Model options, see model.options
+    :return: Dict with for each component whether it is included
+    """
+    if options is None:
+        options = create_options()
+    if sets['mother_vessels'] and not options['mothervessel_extension']:
+        raise ValueError("The sets have mothervessels but the option mothervessel_extension is False, "
+                         "create the sets with the same options")
+
+    return {
+        'core': True,
+        'inventory': options['inventory_extension'] and len(sets['spare_parts']) > 0,
+        'mother_vessels': len(sets['mother_vessels']) > 0,
+    }
@@ -0,0 +1,104 @@
+import itertools
+import numpy as np
+from gurobipy import *
+
+
+def create_table(names=True):
+    """
+    Create the side table of a model, mapping (family, index tuple) to the index of the constraint
+    :param names: Whether the constraints are named when they are added
+    :return: Dict with the linear and general constraint families
+    """
+    return {'names': names, 'linear': {}, 'general': {}, 'n_linear': 0, 'n_general': 0}
+
+
+def family(name_format, rows, axes=None, keys=None):
+    """
+    Family of constraints with the same name format, e.g. all rows of constraint 16
+    :param name_format: Format of the constraint names, filled with the index tuple, e.g. "16.time_spent_on_tasks_{},{},{},{}"
+    :param rows: Position of each row within the constraints added at once
+    :param axes: Set elements along each index, for a family with a row for every combination
+    :param keys: Index tuple of each row, for a family with rows for some combinations only
+    :return: Dict describing the family
+    """
+    return {'id': name_format.split('.')[0], 'format': name_format, 'rows': np.asarray(rows, dtype=np.int64).ravel(),
+            'axes': axes, 'keys': keys}
+
+
+def family_keys(entry):
+    """
+    Index tuples of the rows of a family, in the order of its rows
+    """
+    if entry['keys'] is not None:
+        return entry['keys']
+    return list(itertools.product(*entry['axes']))
+
+
+def family_names(entry):
+    """
+    Names of the rows of a family, in the order of its rows
+    """
+    return [entry['format'].format(*(key if isinstance(key, tuple) else (key,))) for key in family_keys(entry)]
+
+
+def block_names(n, families):
+    """
+    Names of a block of n constraints that is added at once, from the families of the block
+    """
+    names = np.empty(n, dtype=object)
+    for entry in families:
+        names[entry['rows']] = family_names(entry)
+    return names.tolist()
+
+
+def register(table, kind, n, families):
+    """
+    Add the families of a block of n constraints, added after all constraints in the table, to the table
+    :param table: Side table, see create_table()
+    :param kind: 'linear' or 'general'
+    :param n: Number of constraints in the block
+    :param families: Families of the block, see family()
+    """
+    start = table[f'n_{kind}']
+    for entry in families:
+        entry = dict(entry, rows=entry['rows'] + start)
+        table[kind][entry['id']] = entry
+    table[f'n_{kind}'] = start + n
+
+
+def constraint_index(model, family_id, key):
+    """
+    Index of a constraint in the model, e.g. constraint_index(model, '16', ('B1', 'V1', 3, 'M1'))
+    :param model: Gurobi model built by model.build.build_model()
+    :param family_id: Number of the constraint family as used in its name, e.g. '16' or '17a'
+    :param key: Index tuple of the constraint
+    :return: Tuple with 'linear' or 'general' and the index in model.getConstrs() or model.getGenConstrs()
+    """
+    table = model._constraint_table
+    for kind in ['linear', 'general']:
+        if family_id in table[kind]:
+            entry = table[kind][family_id]
+            if entry['keys'] is not None:
+                position = entry['keys'].index(key)
+            else:
+                key = key if isinstance(key, tuple) else (key,)
+                position = np.ravel_multi_index([list(axis).index(k) for axis, k in zip(entry['axes'], key)],
+                                                 [len(axis) for axis in entry['axes']])
+            return kind, int(entry['rows'][position])
+    raise KeyError(f"Unknown constraint family {family_id}")
+
+
+def restore_constraint_names(model):
+    """
+    Name the constraints of a model that was built without names, e.g. before writing an IIS
+    :param model: Gurobi model built by model.build.build_model()
+    """
+    table = getattr(model, '_constraint_table', None)
+    if table is None or table['names']:
+        return
+    model.update()
+    for kind, constrs, attribute in [('linear', model.getConstrs(), GRB.Attr.ConstrName),
+                                     ('general', model.getGenConstrs(), GRB.Attr.GenConstrName)]:
+        for entry in table[kind].values():
+            model.setAttr(attribute, [constrs[i] for i in entry['rows']], family_names(entry))
+    table['names'] = True
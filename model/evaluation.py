@@ -0,0 +1,502 @@
+import os
+import hashlib
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from gurobipy import *
+from model.build import build_model
+from model.options import create_options
+from utils.solution_utils import fix_fleet, flatten_decision_vars
+from utils.weather import CACHE_DIR
+
+# Solver parameters of the model that the workers copy, part of the key of the stored evaluations
+SOLVER_PARAMETERS = ['MIPGap', 'MIPGapAbs', 'TimeLimit', 'Seed']
+CACHE_VERSION = 2           # Increase when the stored evaluations change
+# Results that the cache keeps: final ones, and CUTOFF with the cutoff it holds for (not e.g. TIME_LIMIT)
+CACHED_STATUSES = (GRB.OPTIMAL, GRB.INFEASIBLE, GRB.CUTOFF)
+
+# Positions of the locations in the keys of the dispatch variables, see start_layout()
+LOCATION_POSITIONS = {
+    'task_performed': (0,), 'bundle_performed': (0,), 'hours_spent': (0,),
+    'inventory_level': (1,), 'order_quantity': (1,), 'order_trigger': (1,), 'mv_offshore': (0,),
+    'lambda_P': (1, 2), 'lambda_CH': (1, 2), 'mu_P': (1, 2), 'mu_CH': (1, 2),
+    'mv_purchased': (0, 1), 'mv_chartered': (0, 1),
+}
+
+# Model and variables of a worker process, see init_worker()
+_worker = {}
+
+
+def create_evaluator(model, sets, params, vars, options=None):
+    """
+    Create the engine that evaluates fleets: the optimal cost of the model with the base use, purchased vessels
+    and chartered vessels fixed to a fleet vector (order of utils.solution_utils.flatten_decision_vars)
+    With more than one worker (option 'evaluation_workers') every worker process builds its own copy of the model
+    from the sets and parameters. The Gurobi threads (option 'evaluation_threads') are split across the workers.
+    Every fleet is solved once, the results are kept in a cache (option 'evaluation_cache') keyed by the fleet.
+    Neighbours of a solution start from its dispatch (option 'evaluation_warm_start', see mip_start()) and are
+    abandoned once they cannot beat the best neighbour so far (option 'evaluation_cutoff', see evaluate_fleets()).
+    Neighbours can be screened by a lower bound first (option 'evaluation_screening', see screen_fleet()).
+    :param model: Gurobi model, evaluates the fleets when there are no workers
+    :param sets: Sets
+    :param params: Parameters
+    :param vars: Variables of the model
+    :param options: Model options, see model.options
+    :return: Dict with the evaluator, close it with close_evaluator()
+    """
+    if options is None:
+        options = create_options()
+    workers = options['evaluation_workers']
+    budget = options['evaluation_threads'] or (os.cpu_count() if workers > 1 else 0)
+    threads = max(1, budget // workers) if budget else 0
+
+    evaluator = {'model': model, 'vars': vars, 'workers': workers, 'threads': threads, 'pool': None,
+                 'tolerance': model.Params.MIPGap, 'evaluations': 0, 'runtime': 0.0, 'hits': 0,
+                 'cache': None, 'cache_path': None, 'dominated': 0,
+                 'warm_start': options['evaluation_warm_start'], 'cutoff': options['evaluation_cutoff'],
+                 'layout': start_layout(model, sets, vars) if options['evaluation_warm_start'] else None,
+                 'screening': options['evaluation_screening'], 'top_k': options['evaluation_top_k'],
+                 'screening_time': options['evaluation_screening_time'], 'relaxation': None,
+                 'screenings': 0, 'screening_runtime': 0.0, 'saved': 0}
+    solver_parameters = {name: model.getParamInfo(name)[2] for name in SOLVER_PARAMETERS}
+    if options['evaluation_cache'] != 'none':
+        evaluator['cache'] = {}
+    if options['evaluation_cache'] == 'disk':
+        evaluator['cache_path'] = os.path.join(CACHE_DIR, f'evaluations_v{CACHE_VERSION}_{instance_hash(sets, params, options, solver_parameters)[:16]}.pkl')
+        evaluator['cache'] = load_evaluations(evaluator['cache_path'])
+    if workers > 1:
+        evaluator['pool'] = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=init_worker,
+                                                initargs=(sets, params, options, threads, solver_parameters))
+    else:
+        if threads:
+            model.Params.Threads = threads
+        if options['evaluation_screening'] == 'lp':
+            evaluator['relaxation'] = relax_model(model, vars)
+    return evaluator
+
+
+def init_worker(sets, params, options, threads, solver_parameters):
+    """
+    Build the model of a worker process, once when the process starts
+    """
+    model, vars = build_model(sets, params, options)
+    model.Params.OutputFlag = 0
+    model.Params.Threads = threads
+    for name, value in solver_parameters.items():
+        model.setParam(name, value)
+    _worker['model'], _worker['vars'] = model, vars
+    _worker['relaxation'] = relax_model(model, vars) if options['evaluation_screening'] == 'lp' else None
+
+
+def relax_model(model, vars):
+    """
+    LP relaxation of the model for the screening: integer variables continuous, indicator constraints dropped
+    (Model.relax()), so its optimum is a lower bound of the model with the same fleet
+    :param model: Gurobi model
+    :param vars: Variables of the model
+    :return: Tuple with the relaxed model and its fleet variables (order of flatten_decision_vars)
+    """
+    model.update()
+    relaxed = model.relax()
+    relaxed.Params.OutputFlag = 0
+    columns = relaxed.getVars()
+    return relaxed, [columns[var.index] for var in flatten_decision_vars(vars)]
+
+
+def evaluate_fleet(model, vars, fleet, start=None, cutoff=GRB.INFINITY, keep_solution=False):
+    """
+    Solve the model with the fleet fixed. The model is reset first, so the result does not depend on the fleets
+    evaluated before (or on the worker that evaluates it)
+    :param model: Gurobi model
+    :param vars: Variables of the model
+    :param fleet: Fleet vector
+    :param start: MIP start, value of every variable in column order (GRB.UNDEFINED for none), see mip_start()
+    :param cutoff: Cutoff of the solve, a fleet that cannot beat it is abandoned with status CUTOFF
+    :param keep_solution: Add the values of all variables to the result (the start of its own neighbours)
+    :return: Dict with the objective (inf if not solved to optimality), the status and the solve time, the
+             cutoff when abandoned and the solution when kept
+    """
+    fix_fleet(model, vars, fleet)
+    model.reset()
+    model.NumStart = 0
+    if start is not None:
+        model.setAttr(GRB.Attr.Start, model.getVars(), list(start))
+    model.Params.Cutoff = cutoff
+    model.optimize()
+
+    result = {'objective': model.ObjVal if model.Status == GRB.OPTIMAL else float('inf'), 'status': model.Status,
+              'runtime': model.Runtime}
+    if model.Status == GRB.CUTOFF:
+        result['cutoff'] = cutoff
+    if keep_solution and model.Status == GRB.OPTIMAL:
+        result['solution'] = np.array(model.getAttr(GRB.Attr.X, model.getVars()))
+
+    # Leave no start or cutoff behind for other solves of the model
+    model.NumStart = 0
+    model.Params.Cutoff = GRB.INFINITY
+    return result
+
+
+def evaluate_in_worker(fleet, start, cutoff, keep_solution):
+    """
+    Evaluate a fleet on the model of the worker process
+    """
+    return evaluate_fleet(_worker['model'], _worker['vars'], fleet, start, cutoff, keep_solution)
+
+
+def screen_fleet(model, vars, relaxation, fleet, time_limit):
+    """
+    Lower bound of the objective of a fleet, to rank and prune neighbours before the full solves
+    'lp' screening (a relaxation) solves the LP relaxation, 'mip' screening (no relaxation) the model with a
+    time limit, its best bound. A fleet the screening solves to the end (optimal or infeasible) needs no full solve.
+    :param model: Gurobi model
+    :param vars: Variables of the model
+    :param relaxation: Relaxed model with its fleet variables (see relax_model()), None for 'mip' screening
+    :param fleet: Fleet vector
+    :param time_limit: Time limit of the 'mip' screening (seconds)
+    :return: Dict with the bound, the solve time and the result of the fleet when solved (see evaluate_fleet()),
+             'screened' when no full solve was needed
+    """
+    if relaxation is not None:
+        relaxed, fleet_vars = relaxation
+        relaxed.setAttr(GRB.Attr.LB, fleet_vars, list(fleet))
+        relaxed.setAttr(GRB.Attr.UB, fleet_vars, list(fleet))
+        relaxed.reset()
+        relaxed.optimize()
+        screening = {'bound': relaxed.ObjVal if relaxed.Status == GRB.OPTIMAL else -float('inf'),
+                     'runtime': relaxed.Runtime}
+        if relaxed.Status == GRB.INFEASIBLE:
+            screening['result'] = {'objective': float('inf'), 'status': GRB.INFEASIBLE, 'runtime': 0.0,
+                                   'screened': True}
+        return screening
+
+    full_time_limit = model.Params.TimeLimit
+    fix_fleet(model, vars, fleet)
+    model.reset()
+    model.NumStart = 0
+    model.Params.TimeLimit = min(time_limit, full_time_limit)
+    model.optimize()
+    model.Params.TimeLimit = full_time_limit
+
+    screening = {'bound': model.ObjBound if model.Status == GRB.TIME_LIMIT else -float('inf'),
+                 'runtime': model.Runtime}
+    if model.Status in (GRB.OPTIMAL, GRB.INFEASIBLE):
+        screening['result'] = {'objective': model.ObjVal if model.Status == GRB.OPTIMAL else float('inf'),
+                               'status': model.Status, 'runtime': model.Runtime}
+    return screening
+
+
+def screen_in_worker(fleet, time_limit):
+    """
+    Screen a fleet on the model of the worker process
+    """
+    return screen_fleet(_worker['model'], _worker['vars'], _worker['relaxation'], fleet, time_limit)
+
+
+def start_layout(model, sets, vars):
+    """
+    Columns of the variables that a move of the fleet affects, to adjust the MIP start of a neighbour
+    (see mip_start()). The workers build the same model, so the columns are the same in every worker.
+    :param model: Gurobi model
+    :param sets: Sets
+    :param vars: Variables of the model
+    :return: Dict with the columns of the fleet vector 'fleet', the locations of each position of the fleet
+             vector 'fleet_locations', the columns of the dispatch variables per location 'locations' and the
+             columns of the other variables (the tasks late and not performed, carry-over) 'shared'
+    """
+    model.update()
+    bases, vessels, charter_periods = sets['bases'], sets['vessels'], sets['charter_periods']
+    mother_vessels = set(sets['mother_vessels'])
+
+    # A vessel is located at its base, a mothervessel also is a location itself. The ctvessels at all bases
+    # together bound the dispatch from every mothervessel (constraint 29)
+    def vessel_locations(b, v):
+        return [b, v] if v in mother_vessels else [b] + list(sets['mother_vessels'])
+
+    fleet_locations = ([vessel_locations(b, v) for b in bases for v in vessels]
+                       + [vessel_locations(b, v) for b in bases for v in vessels for p in charter_periods]
+                       + [[b] for b in bases])
+    fleet = np.array([var.index for var in flatten_decision_vars(vars)], dtype=np.int64)
+
+    locations = {e: [] for e in sets['locations']}
+    for name, location_positions in LOCATION_POSITIONS.items():
+        if vars.get(name) is None:
+            continue
+        for key, var in vars[name].items():
+            for i in location_positions:
+                locations[key[i]].append(var.index)
+
+    located = np.zeros(model.NumVars, dtype=bool)
+    located[fleet] = True
+    for columns in locations.values():
+        located[columns] = True
+    return {'fleet': fleet, 'fleet_locations': fleet_locations,
+            'locations': {e: np.array(columns, dtype=np.int64) for e, columns in locations.items()},
+            'shared': np.flatnonzero(~located)}
+
+
+def mip_start(layout, parent_fleet, parent_solution, fleet):
+    """
+    MIP start of a neighbour: the solution of its parent with the fleet of the neighbour. The dispatch at the
+    locations the move changes (its base, and every mothervessel when a ctvessel count changes, see
+    start_layout()) and the variables shared by all locations are left undefined, Gurobi completes them. The
+    start is not guaranteed to be feasible, Gurobi discards it when it cannot complete it.
+    :param layout: Columns of the variables, see start_layout()
+    :param parent_fleet: Fleet vector of the parent
+    :param parent_solution: Values of all variables in the solution of the parent
+    :param fleet: Fleet vector of the neighbour
+    :return: Value of every variable in column order, GRB.UNDEFINED where undefined
+    """
+    start = np.array(parent_solution, dtype=float)
+    start[layout['fleet']] = fleet
+    changed = {e for i in range(len(fleet)) if round(fleet[i]) != round(parent_fleet[i])
+               for e in layout['fleet_locations'][i]}
+    for e in changed:
+        start[layout['locations'][e]] = GRB.UNDEFINED
+    start[layout['shared']] = GRB.UNDEFINED
+    return start
+
+
+def evaluate_fleets(evaluator, fleets, parent=None, cutoff=False, screen=False):
+    """
+    Evaluate fleets, in parallel when the evaluator has workers. Fleets in the cache are not solved again, nor
+    are duplicates within the fleets
+    With a cutoff (and the option 'evaluation_cutoff') the fleets are solved in rounds of one fleet per worker,
+    with the Cutoff at the best objective so far plus the relative MIP gap (ties stay solvable, see
+    best_index()). A fleet that cannot beat it is dominated: abandoned with status CUTOFF and objective inf.
+    The best fleet is always solved to optimality, so the chosen fleet is the same as without the cutoff.
+    With screening (and the option 'evaluation_screening') every fleet gets a lower bound first (see
+    screen_fleet()). The fleets are solved in the order of their bounds, only the first 'evaluation_top_k' of
+    them (0: all), and a fleet whose bound is above the best objective so far is pruned without a full solve
+    (status CUTOFF). A fleet with an infeasible LP relaxation is infeasible without a full solve. Without a top-k
+    limit the chosen fleet is the same as without the screening.
+    :param evaluator: Evaluator, see create_evaluator()
+    :param fleets: List of fleet vectors
+    :param parent: Tuple with the fleet vector and the result of the solution the fleets are neighbours of,
+                   its solution is the MIP start of the fleets (option 'evaluation_warm_start')
+    :param cutoff: Abandon the fleets that cannot beat the best fleet so far
+    :param screen: Screen the fleets by a lower bound before the full solves
+    :return: List with the result of each fleet, in the order of the fleets (see evaluate_fleet()). Fleets the
+             screening settled or left out have 'screened' set, evaluator['saved'] counts the full solves saved
+    """
+    cache = evaluator['cache'] if evaluator['cache'] is not None else {}
+    keys = [fleet_key(fleet) for fleet in fleets]
+    cutoff = cutoff and evaluator['cutoff']
+    screen = screen and evaluator['screening'] != 'none'
+    warm_start = parent is not None and evaluator['warm_start'] and 'solution' in parent[1]
+
+    # Results known already: in the cache and solved to the end (optimal or infeasible)
+    found = {key: cache[key] for key in dict.fromkeys(keys)
+             if key in cache and cache[key]['status'] in (GRB.OPTIMAL, GRB.INFEASIBLE)}
+    best = min([result['objective'] for result in found.values()], default=float('inf'))
+    pending = [key for key in dict.fromkeys(keys) if key not in found]
+
+    # Screening: a lower bound of every fleet, the full solves in the order of the bounds
+    # Fleets the screening settles (pruned, cached) or leaves out (top-k), both without a full solve
+    solved, pruned, bounds, skipped = {}, {}, {}, []
+    if screen and pending:
+        if evaluator['pool'] is None:
+            screenings = [screen_fleet(evaluator['model'], evaluator['vars'], evaluator['relaxation'], key,
+                                       evaluator['screening_time']) for key in pending]
+        else:
+            screenings = list(evaluator['pool'].map(screen_in_worker, [list(key) for key in pending],
+                                                    [evaluator['screening_time']] * len(pending)))
+        evaluator['screenings'] += len(screenings)
+        evaluator['screening_runtime'] += sum(screening['runtime'] for screening in screenings)
+        for key, screening in zip(pending, screenings):
+            bounds[key] = screening['bound']
+            if 'result' in screening:
+                # Infeasible LP relaxation: no full solve needed. Within the time limit: the full solve
+                (pruned if screening['result'].get('screened', False) else solved)[key] = screening['result']
+        best = min([best] + [result['objective'] for result in solved.values()])
+        # Fleets without a bound (the relaxation not solved) last
+        pending = sorted((key for key in pending if key not in solved and key not in pruned),
+                         key=lambda key: (not np.isfinite(bounds[key]), bounds[key]))
+
+        # Only the best candidates get a full solve
+        if evaluator['top_k']:
+            for key in pending[evaluator['top_k']:]:
+                found[key] = {'objective': float('inf'), 'status': None, 'runtime': 0.0, 'bound': bounds[key],
+                              'screened': True}
+                skipped.append(key)
+            pending = pending[:evaluator['top_k']]
+
+    size = evaluator['workers'] if cutoff or screen else max(len(pending), 1)
+    for first in range(0, len(pending), size):
+        threshold = best + evaluator['tolerance'] * abs(best) if best < float('inf') else GRB.INFINITY
+
+        round_keys = []
+        for key in pending[first:first + size]:
+            if bounds.get(key, -float('inf')) > threshold:
+                # The bound proves the fleet cannot beat the best one
+                pruned[key] = {'objective': float('inf'), 'status': GRB.CUTOFF, 'runtime': 0.0,
+                               'cutoff': threshold, 'bound': bounds[key], 'screened': True}
+            elif cutoff and key in cache and cache[key]['status'] == GRB.CUTOFF and cache[key]['cutoff'] >= threshold:
+                # A fleet dominated at a higher cutoff before is dominated now as well
+                found[key] = cache[key]
+            else:
+                round_keys.append(key)
+
+        solve_cutoff = threshold if cutoff else GRB.INFINITY
+        starts = [mip_start(evaluator['layout'], parent[0], parent[1]['solution'], key) if warm_start else None
+                  for key in round_keys]
+        if evaluator['pool'] is None:
+            results = [evaluate_fleet(evaluator['model'], evaluator['vars'], key, start, solve_cutoff, evaluator['warm_start'])
+                       for key, start in zip(round_keys, starts)]
+        else:
+            n = len(round_keys)
+            results = list(evaluator['pool'].map(evaluate_in_worker, [list(key) for key in round_keys], starts,
+                                                 [solve_cutoff] * n, [evaluator['warm_start']] * n))
+        solved.update(zip(round_keys, results))
+        best = min([best] + [result['objective'] for result in results])
+
+    found.update(solved)
+    found.update(pruned)
+    evaluator['evaluations'] += len(solved)
+    evaluator['runtime'] += sum(result['runtime'] for result in solved.values())
+    evaluator['hits'] += len(keys) - len(solved) - len(pruned) - len(skipped)
+    evaluator['dominated'] += sum(found[key]['status'] == GRB.CUTOFF and not found[key].get('screened', False)
+                                 for key in keys)
+    evaluator['saved'] += len(pruned) + len(skipped)
+
+    # Only results that hold for any later search, a fleet that hit the time limit is solved again
+    if evaluator['cache'] is not None:
+        settled = {key: result for key, result in {**solved, **pruned}.items() if result['status'] in CACHED_STATUSES}
+        cache.update(settled)
+        if evaluator['cache_path'] is not None and settled:
+            save_evaluations(evaluator['cache_path'], settled)
+    return [found[key] for key in keys]
+
+
+def fleet_key(fleet):
+    """
+    Key of a fleet vector in the cache of evaluated fleets, the vector as a tuple of integers
+    """
+    return tuple(int(round(value)) for value in fleet)
+
+
+def instance_hash(sets, params, options, solver_parameters):
+    """
+    Hash of the model instance: the scenario with its sets (including the corrective failures) and parameters
+    (including the weather), the options of the model and the solver parameters that decide the results
+    (SOLVER_PARAMETERS). The GRASP options are left out. The parameters are hashed from the arrays of their
+    store (the other parameters are views of it), the sets from plain values and arrays, so the hash does not
+    depend on how pandas pickles.
+    :param sets: Sets
+    :param params: Parameters
+    :param options: Model options, see model.options
+    :param solver_parameters: Dict with the value of each solver parameter
+    :return: Hex digest
+    """
+    model_options = {key: value for key, value in options.items() if not key.startswith(('evaluation_', 'construction'))}
+    digest = hashlib.sha256()
+    for value in (sets, params['store'], params['feasible_bundles'], model_options, solver_parameters):
+        hash_value(digest, value)
+    return digest.hexdigest()
+
+
+def hash_value(digest, value):
+    """
+    Add a value to a hash: dicts (in the order of their keys), lists and tuples, NumPy arrays by their bytes,
+    pandas frames by their index, columns and values, and plain values by their representation
+    :param digest: hashlib hash object
+    :param value: Value to add
+    """
+    if isinstance(value, dict):
+        digest.update(f'dict{len(value)}'.encode())
+        for key in sorted(value, key=repr):
+            hash_value(digest, key)
+            hash_value(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}{len(value)}'.encode())
+        for element in value:
+            hash_value(digest, element)
+    elif isinstance(value, pd.DataFrame):
+        digest.update(b'frame')
+        for part in (value.index.tolist(), value.columns.tolist(), value.to_numpy()):
+            hash_value(digest, part)
+    elif isinstance(value, np.ndarray):
+        digest.update(f'array{value.dtype.str}{value.shape}'.encode())
+        if value.dtype == object:
+            hash_value(digest, value.tolist())
+        else:
+            digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        hash_value(digest, value.item())
+    else:
+        digest.update(f'{type(value).__name__}:{value!r}'.encode())
+
+
+def load_evaluations(cache_path):
+    """
+    Load the evaluated fleets of an instance from disk
+    :param cache_path: Path of the stored evaluations
+    :return: Dict with the result per fleet key, empty when nothing is stored yet or stored by another version
+    """
+    if not os.path.exists(cache_path):
+        return {}
+    with open(cache_path, 'rb') as f:
+        stored = pickle.load(f)
+    if stored.get('version') != CACHE_VERSION:
+        return {}
+    return stored['fleets']
+
+
+def save_evaluations(cache_path, results):
+    """
+    Add evaluated fleets to the ones stored on disk, merged with what other runs stored in the meantime
+    :param cache_path: Path of the stored evaluations
+    :param results: Dict with the result per fleet key
+    """
+    fleets = load_evaluations(cache_path)
+    # The solutions (MIP starts of the neighbours) are only kept in memory
+    fleets.update({key: {name: value for name, value in result.items() if name != 'solution'}
+                   for key, result in results.items()})
+
+    # Write to a temporary file first, so concurrent runs never read a half-written file
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f'{cache_path}.tmp{os.getpid()}'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': CACHE_VERSION, 'fleets': fleets}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def best_index(objectives, tolerance=0.0):
+    """
+    Index of the best objective. Objectives within the relative MIP gap of the lowest one are ties (the solves
+    only prove them within the gap, whatever the threads per solve), the first of them is chosen
+    :param objectives: List of objective values
+    :param tolerance: Relative tolerance, the MIPGap of the solves
+    :return: Index of the chosen objective
+    """
+    best = min(objectives)
+    if best == float('inf'):
+        return objectives.index(best)
+    return next(i for i, objective in enumerate(objectives) if objective <= best + tolerance * abs(best))
+
+
+def close_evaluator(evaluator):
+    """
+    Stop the worker processes of the evaluator
+    """
+    if evaluator['pool'] is not None:
+        evaluator['pool'].shutdown()
+        evaluator['pool'] = None
+
+
+def print_evaluations(evaluator):
+    """
+    Print how many fleets the evaluator solved, with how many workers and the total solve time, and how many
+    evaluations the cache saved, how many fleets were dominated (abandoned at the cutoff) and how many full solves
+    the screening saved
+    """
+    threads = evaluator['threads'] or 'default'
+    print(f"Evaluated {evaluator['evaluations']} fleets with {evaluator['workers']} worker(s) "
+          f"({threads} threads each), total solve time {evaluator['runtime']:.2f} s, "
+          f"{evaluator['hits']} evaluations from the cache, {evaluator['dominated']} neighbours dominated")
+    if evaluator['screening'] != 'none':
+        print(f"Screened {evaluator['screenings']} fleets ({evaluator['screening']}), screening time "
+              f"{evaluator['screening_runtime']:.2f} s, {evaluator['saved']} full solves saved")
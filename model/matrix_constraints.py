@@ -0,0 +1,535 @@
+import itertools
+import numpy as np
+import scipy.sparse as sp
+from gurobipy import *
+from utils.utils import unpack_sets, unpack_parameters, unpack_variables
+from model.options import create_options
+from model.parameter_store import positions
+from model.constraint_table import create_table, family, block_names, register
+from model.big_m import indicator_big_m, constraint_big_m
+from model.components import model_components
+
+
+def var_index(vars, *axes):
+    """
+    Column index of the variables of a tupledict, as an array with one dimension per axis
+    :param vars: Variables indexed by the elements of the axes, sparse families (e.g. task_performed) have no
+                 variable for some combinations
+    :param axes: Set elements along each dimension
+    :return: Array with the column index of every variable, -1 where there is no variable
+    """
+    keys = itertools.product(*axes) if len(axes) > 1 else axes[0]
+    return np.array([vars[key].index if key in vars else -1 for key in keys], dtype=np.int64).reshape([len(axis) for axis in axes])
+
+
+def terms(rows, cols, coefs=1.0):
+    """
+    Coefficients of a family of constraints, the three arrays are broadcast against each other
+    :param rows: Row of each coefficient within the family, -1 for a row that is left out
+    :param cols: Column index of the variable of each coefficient, -1 for a variable that does not exist
+    :param coefs: Value of each coefficient
+    :return: Tuple with the flat rows, columns and values
+    """
+    rows, cols, coefs = np.broadcast_arrays(rows, cols, np.asarray(coefs, dtype=np.float64))
+    return rows.ravel(), cols.ravel(), coefs.ravel()
+
+
+def add_rows(model, table, entries, sense, rhs, families):
+    """
+    Add a block of linear constraints as one sparse matrix constraint
+    :param model: Gurobi model
+    :param table: Side table of the model, see model.constraint_table
+    :param entries: List with the coefficients of the block, see terms()
+    :param sense: Sense of all rows, or an array with the sense of each row
+    :param rhs: Right-hand side of each row
+    :param families: Families of the rows in the block, see model.constraint_table.family()
+    """
+    rhs = np.asarray(rhs, dtype=np.float64).ravel()
+    if len(rhs) == 0:
+        return
+    rows, cols, coefs = (np.concatenate(values) for values in zip(*entries))
+    nonzero = (coefs != 0) & (rows >= 0) & (cols >= 0)
+    A = sp.csr_matrix((coefs[nonzero], (rows[nonzero], cols[nonzero])), shape=(len(rhs), model.NumVars))
+    model.addMConstr(A, None, sense, rhs, name=block_names(len(rhs), families) if table['names'] else "")
+    register(table, 'linear', len(rhs), families)
+
+
+def add_matrix_constraints(model, sets, params, vars, options=None):
+    """
+    Add the constraints to the model, building every family at once from the parameter store
+    The model is identical to the one of model.constraints.add_constraints(), the rows are added in the
+    same order and with the same names. Without names (option 'constraint_names') the side table of the
+    model, model._constraint_table, still maps every family and index tuple to its constraint.
+    :param model: Gurobi model, updated after the variables were created
+    :param sets: Sets
+    :param params: Parameters
+    :param vars: Variables
+    :param options: Model options, see model.options
+    :return:
+    """
+    if options is None:
+        options = create_options()
+
+    # Unpack sets
+    (bases, vessels, periods, charter_dict, charter_periods, tasks, vessel_task_compatibility,
+     prev_tasks, corr_tasks, planned_prev_tasks, planned_corr_tasks, bundle_dict, bundles, spare_parts,
+     mother_vessels, ctvessels, locations) = unpack_sets(sets)
+
+    # Unpack parameters
+    (cost_base_operation, cost_vessel_purchase, cost_vessel_charter,
+     cost_vessel_operation, cost_technicians, cost_downtime,
+     penalty_preventive_late, penalty_not_performed, vessel_speed,
+     transfer_time, max_time_offshore, max_vessels_available_charter,
+     distance_base_OWF, technicians_available, capacity_base_for_vessels,
+     capacity_vessel_for_technicians, failure_rate, time_to_perform_task,
+     technicians_required_task, latest_period_to_perform_task,
+     tasks_in_bundles, technicians_required_bundle, weather_max_time_offshore,
+     order_cost, lead_time, holding_cost, parts_required, max_part_capacity,
+     reorder_level, big_m, max_capacity_for_docking,
+     additional_time, tech_standby_cost, initial_inventory, feasible_bundles,
+     charter_period_of, corrective_failures, cumulative_corrective_failures, store) = unpack_parameters(params)
+
+    # Components in the model, see model.components
+    components = model_components(sets, options)
+
+    # Unpack variables
+    (base_use, purchased_vessels, chartered_vessels, task_performed,
+     bundle_performed, tasks_late, tasks_not_performed,
+     periods_late, hours_spent, inventory_level, order_quantity,
+     order_trigger, mv_offshore, lambda_P, lambda_CH, mu_P, mu_CH) = unpack_variables(vars)
+
+    # Positions of the subsets within the sets of the parameter store
+    index = store['index']
+    ctv_vessel = positions(index, 'vessels', ctvessels)
+    mv_vessel = positions(index, 'vessels', mother_vessels)
+    base_location = positions(index, 'locations', bases)
+    mv_location = positions(index, 'locations', mother_vessels)
+    prev_task = positions(index, 'tasks', prev_tasks)
+    corr_task = positions(index, 'tasks', corr_tasks)
+    charter_position = store['charter_period_of'] - 1
+    n_bases, n_vessels, n_periods, n_tasks = len(bases), len(vessels), len(periods), len(tasks)
+    n_ctvs, n_mvs, n_locations, n_parts = len(ctvessels), len(mother_vessels), len(locations), len(spare_parts)
+
+    # Column indices of the variables
+    Z = var_index(base_use, bases)
+    X = var_index(purchased_vessels, bases, vessels)
+    CH = var_index(chartered_vessels, bases, vessels, charter_periods)
+    Y = var_index(task_performed, locations, ctvessels, periods, tasks)
+    # Hours spent, in the aggregate formulation the task time (H_coef) times task_performed
+    if options['time_spent_formulation'] == 'aggregate':
+        H, H_coef = Y, store['time_to_perform_task']
+    else:
+        H, H_coef = var_index(hours_spent, locations, ctvessels, periods, tasks), 1.0
+    TL = var_index(tasks_late, prev_tasks)
+    TNP = var_index(tasks_not_performed, tasks)
+    PL = var_index(periods_late, periods, corr_tasks)
+    if components['inventory']:
+        IL = var_index(inventory_level, spare_parts, locations, periods)
+        OQ = var_index(order_quantity, spare_parts, locations, periods)
+        OT = var_index(order_trigger, spare_parts, locations, periods)
+        LP = var_index(lambda_P, spare_parts, bases, mother_vessels, periods)
+        LCH = var_index(lambda_CH, spare_parts, bases, mother_vessels, periods)
+    # Without mothervessels the inventory rows at the mothervessels are empty, so MVO is too
+    MVO = var_index(mv_offshore, mother_vessels, periods) if components['mother_vessels'] else np.zeros((0, n_periods), dtype=np.int64)
+    columns = model.getVars()
+
+    # Side table with the constraint families
+    table = create_table(options['constraint_names'])
+    table['n_linear'], table['n_general'] = model.NumConstrs, model.NumGenConstrs
+
+    # Bundle variables, one entry per feasible (location, ctvessel, period, bundle)
+    bundle_keys = list(bundle_performed.keys())
+    N = np.array([bundle_performed[key].index for key in bundle_keys], dtype=np.int64)
+    n_e = positions(index, 'locations', [key[0] for key in bundle_keys])
+    n_v = positions(index, 'ctvessels', [key[1] for key in bundle_keys])
+    n_p = positions(index, 'periods', [key[2] for key in bundle_keys])
+    n_k = positions(index, 'bundles', [key[3] for key in bundle_keys])
+    base_rank = np.full(n_locations, -1)
+    base_rank[base_location] = np.arange(n_bases)
+    mv_rank = np.full(n_locations, -1)
+    mv_rank[mv_location] = np.arange(n_mvs)
+    at_base = base_rank[n_e] >= 0
+    at_mv = mv_rank[n_e] >= 0
+
+    # Time capacity of the bundle of each bundle variable (constraints 3 - 5)
+    size = np.array([len(bundle_dict[k]) for k in bundles], dtype=np.int64)[n_k]
+    transfer = store['transfer_time'][ctv_vessel][n_v]
+    offshore_capacity = size * (store['max_time_offshore'][ctv_vessel][n_v] - transfer * (1 + size))
+    weather_capacity = size * (store['weather_max_time_offshore'][ctv_vessel][n_v, n_p] - transfer * (1 + size))
+    travel = 2 * (store['distance_base_OWF'][n_e] / store['vessel_speed'][ctv_vessel][n_v])
+
+    # Parameter arrays
+    time_task = store['time_to_perform_task']
+    parts = store['parts_required']                                 # (tasks, spare_parts)
+    reorder = store['reorder_level']
+    capacity = store['max_part_capacity']
+    initial = np.array([int(i) for i in store['initial_inventory']], dtype=np.int64)
+
+    # Purchased and (per period) chartered vessels of the ctvessels and mothervessels
+    X_ctv, X_mv = X[:, ctv_vessel], X[:, mv_vessel]                                # (bases, vessels)
+    CH_ctv = CH[:, ctv_vessel][:, :, charter_position]                             # (bases, vessels, periods)
+    CH_mv = CH[:, mv_vessel][:, :, charter_position]
+
+
+    # Constraint 1: Base capacity for vessels
+    rows = np.arange(n_bases * n_vessels * len(charter_periods)).reshape(n_bases, n_vessels, -1)
+    add_rows(model, table, [terms(rows, X[:, :, None]), terms(rows, CH),
+                     terms(rows, Z[:, None, None], -store['capacity_base_for_vessels'][:, :, None])],
+             GRB.LESS_EQUAL, np.zeros(rows.shape), [family("1.base_capacity_for_vessels_{},{},{}", rows, axes=(bases, vessels, charter_periods))])
+
+    # Constraint 2: Maximum number of vessels available for charter
+    rows = np.arange(n_vessels * len(charter_periods)).reshape(n_vessels, -1)
+    add_rows(model, table, [terms(rows[:, :, None], CH.transpose(1, 2, 0))],
+             GRB.LESS_EQUAL, np.broadcast_to(store['max_vessels_available_charter'][:, None], rows.shape),
+             [family("2.max_vessels_available_for_charter_{},{}", rows, axes=(vessels, charter_periods))])
+
+    # Constraint 3: Maximum time offshore (operating from base)
+    rows = np.arange(n_bases * n_ctvs * n_periods).reshape(n_bases, n_ctvs, n_periods)
+    add_rows(model, table, [terms(rows[..., None], H[base_location], H_coef),
+                     terms(rows[base_rank[n_e[at_base]], n_v[at_base], n_p[at_base]], N[at_base],
+                           -(offshore_capacity[at_base] - travel[at_base]))],
+             GRB.LESS_EQUAL, np.zeros(rows.shape), [family("3.max_time_offshore_(base)_{},{},{}", rows, axes=(bases, ctvessels, periods))])
+
+    # Constraint 4: Maximum time offshore (operating from mothervessel)
+    rows = np.arange(n_mvs * n_ctvs * n_periods).reshape(n_mvs, n_ctvs, n_periods)
+    add_rows(model, table, [terms(rows[..., None], H[mv_location], H_coef),
+                     terms(rows[mv_rank[n_e[at_mv]], n_v[at_mv], n_p[at_mv]], N[at_mv], -offshore_capacity[at_mv])],
+             GRB.LESS_EQUAL, np.zeros(rows.shape), [family("4.max_time_offshore_(mv)_{},{},{}", rows, axes=(mother_vessels, ctvessels, periods))])
+
+    # Constraint 5: Weather restrictions (for ctvs)
+    rows = np.arange(n_locations * n_ctvs * n_periods).reshape(n_locations, n_ctvs, n_periods)
+    add_rows(model, table, [terms(rows[..., None], H, H_coef), terms(rows[n_e, n_v, n_p], N, -(weather_capacity - travel))],
+             GRB.LESS_EQUAL, np.zeros(rows.shape), [family("5.weather_restrictions_ctv_{},{},{}", rows, axes=(locations, ctvessels, periods))])
+
+    # Constraint 6: Location capacity for technicians
+    rows = np.arange(n_locations * n_periods).reshape(n_locations, n_periods)
+    add_rows(model, table, [terms(rows[n_e, n_p], N, store['technicians_required_bundle'][n_k])],
+             GRB.LESS_EQUAL, np.broadcast_to(store['technicians_available'][:, None], rows.shape),
+             [family("6.location_capacity_for_technicians_{},{}", rows, axes=(locations, periods))])
+
+    # Constraint 7: Vessel capacity for technicians (left out when the model is reduced, see model.reduction)
+    if not options['reduce_model']:
+        add_rows(model, table, [terms(np.arange(len(N)), N, store['technicians_required_bundle'][n_k]
+                               - store['capacity_vessel_for_technicians'][ctv_vessel][n_v])],
+                 GRB.LESS_EQUAL, np.zeros(len(N)), [family("7.vessel_capacity_for_technicians_{},{},{},{}", np.arange(len(N)), keys=bundle_keys)])
+
+    # Constraint 8: Tasks performed limited by number of vessels available
+    rows = np.arange(n_bases * n_ctvs * n_periods).reshape(n_bases, n_ctvs, n_periods)
+    add_rows(model, table, [terms(rows[base_rank[n_e[at_base]], n_v[at_base], n_p[at_base]], N[at_base]),
+                     terms(rows, X_ctv[:, :, None], -1), terms(rows, CH_ctv, -1)],
+             GRB.LESS_EQUAL, np.zeros(rows.shape), [family("8.tasks_performed_limit_{},{},{}", rows, axes=(bases, ctvessels, periods))])
+
+    # Constraint 9: Tasks performed late
+    late = [p - 1 for p in range(latest_period_to_perform_task, periods[-1]+1) if p >= 1]
+    rows = np.arange(len(prev_tasks))
+    add_rows(model, table, [terms(rows[:, None, None, None], np.moveaxis(Y[:, :, late][..., prev_task], -1, 0)),
+                     terms(rows, TL, -1)],
+             GRB.EQUAL, np.zeros(len(rows)), [family("9.tasks_performed_late_{}", rows, axes=(prev_tasks,))])
+
+    # Constraint 10: Vessel-task compatibility, task_performed only exists for the compatible ctvessels (model.variables)
+
+    # Constraint 11: Perform scheduled preventive tasks
+    rows = np.arange(len(prev_tasks))
+    add_rows(model, table, [terms(rows[:, None, None, None], np.moveaxis(Y[..., prev_task], -1, 0)), terms(rows, TNP[prev_task])],
+             GRB.EQUAL, [planned_prev_tasks[m] for m in prev_tasks],
+             [family("11.perform_scheduled_preventive_tasks_{}", rows, axes=(prev_tasks,))])
+
+    # Constraint 12: Perform corrective tasks
+    rows = np.arange(len(corr_tasks))
+    add_rows(model, table, [terms(rows[:, None, None, None], np.moveaxis(Y[..., corr_task], -1, 0)), terms(rows, TNP[corr_task])],
+             GRB.EQUAL, store['cumulative_corrective_failures'][:, -1],
+             [family("12.perform_scheduled_corrective_tasks_{}", rows, axes=(corr_tasks,))])
+
+    # Constraint 13: Corrective tasks performed after failure
+    rows = np.arange(n_periods * len(corr_tasks)).reshape(n_periods, -1)
+    families = [family("13.corrective_tasks_after_failures{1},{0}", rows, axes=(periods, corr_tasks))]
+    Y_corr = np.transpose(Y[..., corr_task], (2, 3, 0, 1))         # (periods, corr_tasks, locations, ctvessels)
+    if options['corrective_precedence_formulation'] == 'nested':
+        earlier = np.arange(n_periods)[None, :] <= np.arange(n_periods)[:, None]
+        add_rows(model, table, [terms(rows[:, None, :, None, None], Y_corr[None], earlier[:, :, None, None, None])],
+                 GRB.LESS_EQUAL, store['cumulative_corrective_failures'][:, 1:].T, families)
+    else:
+        add_rows(model, table, [terms(rows[..., None, None], Y_corr), terms(rows[1:], PL[:-1], -1)],
+                 GRB.LESS_EQUAL, store['corrective_failures'].T, families)
+
+    # Constraint 14: Downtime for corrective tasks (periods late)
+    add_rows(model, table, [terms(rows, PL), terms(rows[..., None, None], Y_corr), terms(rows[1:], PL[:-1], -1)],
+             GRB.EQUAL, store['corrective_failures'].T, [family("14.periods_late_{},{}", rows, axes=(periods, corr_tasks))])
+
+    # Constraint 15: Tasks performed from bundles, a row per task_performed variable (-1 for the incompatible ctvessels)
+    task_keys = list(task_performed.keys())
+    rows = np.full(Y.shape, -1)
+    rows[Y >= 0] = np.arange(len(task_keys))
+    add_rows(model, table, [terms(rows, Y), terms(rows[n_e[:, None], n_v[:, None], n_p[:, None], np.arange(n_tasks)],
+                                           N[:, None], -store['tasks_in_bundles'][:, n_k].T)],
+             GRB.LESS_EQUAL, np.zeros(len(task_keys)), [family("15.tasks_performed_from_bundles_{},{},{},{}", rows[Y >= 0], keys=task_keys)])
+
+    # Constraint 16: Time spent on tasks (no rows in the aggregate formulation, hours_spent is substituted)
+    families = [family("16.time_spent_on_tasks_{},{},{},{}", rows[Y >= 0], keys=task_keys)]
+    if options['time_spent_formulation'] == 'nested':
+        earlier = (np.arange(n_periods)[None, :] < np.arange(n_periods)[:, None])[None, None, :, None, None, None, :]
+        Y_all = np.transpose(Y, (3, 0, 1, 2))[None, None, None]    # (1, 1, 1, tasks, locations, ctvessels, periods)
+        H_all = np.transpose(H, (3, 0, 1, 2))[None, None, None]
+        add_rows(model, table, [terms(rows, Y), terms(rows[..., None, None, None], Y_all, earlier),
+                         terms(rows[..., None, None, None], H_all, -(1 / time_task)[:, None, None, None] * earlier),
+                         terms(rows, H, -1 / time_task)],
+                 GRB.EQUAL, np.zeros(len(task_keys)), families)
+    elif options['time_spent_formulation'] == 'carry_over':
+        # Same constraint (multiplied by the task time), with the sum over the earlier periods kept in the carry-over hours
+        CO = var_index(vars['carry_over_hours'], periods, tasks)
+        carry_rows = np.arange(CO.size).reshape(CO.shape)
+        add_rows(model, table, [terms(carry_rows, CO), terms(carry_rows[1:], CO[:-1], -1),
+                         terms(carry_rows[..., None, None], np.transpose(H, (2, 3, 0, 1)), -1),
+                         terms(carry_rows[..., None, None], np.transpose(Y, (2, 3, 0, 1)), time_task[:, None, None])],
+                 GRB.EQUAL, np.zeros(CO.size), [family("16b.carry_over_hours_{},{}", carry_rows, axes=(periods, tasks))])
+        add_rows(model, table, [terms(rows, Y, time_task), terms(rows[:, :, 1:], CO[:-1], -1), terms(rows, H, -1)],
+                 GRB.EQUAL, np.zeros(len(task_keys)), families)
+
+
+    # --- Constraints for extensions (only for the components in the model) ---
+    # Inventory extension: constraints 17 - 28
+    if components['inventory']:
+        # Constraint 17: Inventory balance for bases
+        if options['indicator_formulation'] == 'indicator':
+            # Indicator constraints have no matrix form, added one by one
+            for i, s in enumerate(spare_parts):
+                for j, e in enumerate(bases):
+                    l = base_location[j]
+                    for t, p in enumerate(periods):
+                        cols = [IL[i, l, t]]
+                        coefs = [1.0]
+                        rhs = 0
+                        if t > 0:
+                            cols.append(IL[i, l, t - 1])
+                            coefs.append(-1.0)
+                        else:
+                            rhs = initial[l]
+                        if p - lead_time[s] > 0:
+                            cols.append(OQ[i, l, p - lead_time[s] - 1])
+                            coefs.append(-1.0)
+                        task_cols = Y[l, :, t, :].T.ravel()
+                        cols.extend(task_cols[task_cols >= 0])
+                        coefs.extend(np.repeat(parts[:, i], n_ctvs)[task_cols >= 0])
+                        cols.extend(np.stack([LP[i, j, :, t], LCH[i, j, :, t]], axis=1).ravel())
+                        coefs.extend([1.0] * 2 * n_mvs)
+                        model.addGenConstrIndicator(columns[Z[j]], 1, LinExpr(coefs, [columns[c] for c in cols]), GRB.EQUAL, rhs, name=f"17a.inventory_balance_bases_{s},{e},{p}" if table['names'] else "")
+                        model.addGenConstrIndicator(columns[Z[j]], 0, LinExpr([1.0], [columns[IL[i, l, t]]]), GRB.EQUAL, 0, name=f"17b.inventory_balance_bases_{s},{e},{p}" if table['names'] else "")
+            n = n_parts * n_bases * n_periods
+            register(table, 'general', 2 * n, [family("17a.inventory_balance_bases_{},{},{}", 2 * np.arange(n), axes=(spare_parts, bases, periods)),
+                                               family("17b.inventory_balance_bases_{},{},{}", 2 * np.arange(n) + 1, axes=(spare_parts, bases, periods))])
+        else:
+            # Linear rows with the smallest big-M, per (spare part, base, period) the rows 17a (<=), 17b and 17c (>=)
+            linear_big_m = indicator_big_m(sets, params)
+            rows = np.arange(n_parts * n_bases * n_periods * 3).reshape(n_parts, n_bases, n_periods, 3)
+            balance_rows = rows[..., [0, 2]]
+            IL_base = IL[:, base_location]
+            entries = [terms(rows, IL_base[..., None]),
+                       terms(balance_rows[:, :, 1:], IL_base[:, :, :-1, None], -1),
+                       terms(balance_rows[..., None, None], np.transpose(Y[base_location], (0, 2, 1, 3))[None, :, :, None],
+                             parts.T[:, None, None, None, None, :]),
+                       terms(balance_rows[..., None], np.transpose(LP, (0, 1, 3, 2))[:, :, :, None]),
+                       terms(balance_rows[..., None], np.transpose(LCH, (0, 1, 3, 2))[:, :, :, None]),
+                       terms(balance_rows, Z[None, :, None, None], linear_big_m['17a'][..., None] * np.array([1, -1])),
+                       terms(rows[..., 1], Z[None, :, None], -linear_big_m['17b'][:, :, None])]
+            for i, s in enumerate(spare_parts):
+                lead = lead_time[s]
+                entries.append(terms(balance_rows[i, :, lead:], OQ[i, base_location, :max(n_periods - lead, 0), None], -1))
+            rhs = np.zeros(rows.shape)
+            rhs[:, :, 0, [0, 2]] = initial[base_location][:, None]
+            rhs[..., [0, 2]] += linear_big_m['17a'][..., None] * np.array([1, -1])
+            add_rows(model, table, entries, np.broadcast_to(np.array([GRB.LESS_EQUAL, GRB.LESS_EQUAL, GRB.GREATER_EQUAL]), rows.shape).ravel(), rhs,
+                     [family(f"17{half}.inventory_balance_bases_{{}},{{}},{{}}", rows[..., j], axes=(spare_parts, bases, periods))
+                      for j, half in enumerate("abc")])
+
+        # Big-M of the constraints 19, 22 - 28, 38 and 39, at the mothervessels and at the bases
+        M = constraint_big_m(sets, params, options['big_m'])
+        M_mv = {c: values[:, mv_location] for c, values in M.items()}
+        M_base = {c: values[:, base_location] for c, values in M.items()}
+
+        # Constraint 18: Inventory balance for mothervessels & Constraint 19: order quantity big m
+        rows = np.arange(n_parts * n_mvs * n_periods * 2).reshape(n_parts, n_mvs, n_periods, 2)
+        rhs = np.zeros(rows.shape)
+        rhs[:, :, 0, 0] = initial[mv_location]
+        rhs[..., 1] = M_mv['19'][:, :, None]
+        add_rows(model, table, [terms(rows[..., 0], IL[:, mv_location]),
+                         terms(rows[:, :, 1:, 0], IL[:, mv_location, :-1], -1),
+                         terms(rows[:, :, 1:, 0], OQ[:, mv_location, :-1], -1),
+                         terms(rows[..., 0, None, None], np.transpose(Y[mv_location], (0, 2, 3, 1))[None],
+                               parts.T[:, None, None, :, None]),
+                         terms(rows[..., 1], OQ[:, mv_location]),
+                         terms(rows[..., 1], MVO[None], M_mv['19'][:, :, None])],
+                 np.tile([GRB.EQUAL, GRB.LESS_EQUAL], rows.size // 2), rhs,
+                 [family("18.inventory_balance_mothervessels_{},{},{}", rows[..., 0], axes=(spare_parts, mother_vessels, periods)),
+                  family("19.order_quantity_mv_{},{},{}", rows[..., 1], axes=(spare_parts, mother_vessels, periods))])
+
+        # Constraint 20: Parts required for maintenance tasks to take place
+        rows = np.arange(n_parts * n_tasks * n_periods * n_locations).reshape(n_parts, n_tasks, n_periods, n_locations)
+        add_rows(model, table, [terms(rows[..., None], np.transpose(Y, (3, 2, 0, 1))[None], parts.T[:, :, None, None, None]),
+                         terms(rows, np.transpose(IL, (0, 2, 1))[:, None], -1)],
+                 GRB.LESS_EQUAL, np.zeros(rows.shape),
+                 [family("20.parts_required_for_maintenance_tasks_{},{},{},{}", rows, axes=(spare_parts, tasks, periods, locations))])
+
+        # Constraint 21: Maximum part capacity (upper bounds when the model is reduced)
+        if not options['reduce_model']:
+            add_rows(model, table, [terms(np.arange(IL.size).reshape(IL.shape), IL)],
+                     GRB.LESS_EQUAL, np.broadcast_to(capacity[:, :, None], IL.shape),
+                     [family("21.max_part_capacity_{},{},{}", np.arange(IL.size), axes=(spare_parts, locations, periods))])
+
+        # Constraint 22 & 23 (activate) and 24 & 25 (deactivate): Order trigger, per spare part first the mothervessels and then the bases
+        block = (n_mvs + n_bases) * n_periods
+        mv_rows = np.arange(n_parts)[:, None, None] * block + np.arange(n_mvs * n_periods).reshape(n_mvs, n_periods)
+        base_rows = np.arange(n_parts)[:, None, None] * block + n_mvs * n_periods + np.arange(n_bases * n_periods).reshape(n_bases, n_periods)
+        rhs = np.zeros(n_parts * block)
+        rhs[mv_rows] = np.broadcast_to((reorder[:, mv_location] + M_mv['22'])[:, :, None], mv_rows.shape)
+        rhs[base_rows] = np.broadcast_to((reorder[:, base_location] + M_base['23'] + M_base['23b'])[:, :, None], base_rows.shape)
+        add_rows(model, table, [terms(mv_rows, IL[:, mv_location]), terms(mv_rows, OT[:, mv_location], M_mv['22'][:, :, None]),
+                         terms(base_rows, IL[:, base_location]), terms(base_rows, OT[:, base_location], M_base['23'][:, :, None]),
+                         terms(base_rows, Z[None, :, None], M_base['23b'][:, :, None])],
+                 GRB.LESS_EQUAL, rhs,
+                 [family("22.order_trigger_activate_MV_{},{},{}", mv_rows, axes=(spare_parts, mother_vessels, periods)),
+                  family("23.order_trigger_activate_base_{},{},{}", base_rows, axes=(spare_parts, bases, periods))])
+        rhs[mv_rows] = np.broadcast_to((reorder[:, mv_location] + 1)[:, :, None], mv_rows.shape)
+        rhs[base_rows] = np.broadcast_to((reorder[:, base_location] + 1 - M_base['25b'])[:, :, None], base_rows.shape)
+        add_rows(model, table, [terms(mv_rows, IL[:, mv_location]), terms(mv_rows, OT[:, mv_location], M_mv['24'][:, :, None]),
+                         terms(base_rows, IL[:, base_location]), terms(base_rows, OT[:, base_location], M_base['25'][:, :, None]),
+                         terms(base_rows, Z[None, :, None], -M_base['25b'][:, :, None])],
+                 GRB.GREATER_EQUAL, rhs,
+                 [family("24.order_trigger_deactivate_MV_{},{},{}", mv_rows, axes=(spare_parts, mother_vessels, periods)),
+                  family("25.order_trigger_deactivate_base_{},{},{}", base_rows, axes=(spare_parts, bases, periods))])
+
+        # Constraint 26 - 28: Order quantity constraints for bases (26a, 27 and 28a added alternately)
+        rows = np.arange(n_parts * n_bases * n_periods * 3).reshape(n_parts, n_bases, n_periods, 3)
+        rhs = np.zeros(rows.shape)
+        rhs[..., 0] = (capacity[:, base_location] + M_base['26'])[:, :, None]
+        rhs[..., 1] = (capacity[:, base_location] - M_base['27'])[:, :, None]
+        add_rows(model, table, [terms(rows, OQ[:, base_location, :, None]),
+                         terms(rows[..., :2], IL[:, base_location, :, None]),
+                         terms(rows[..., :2], OT[:, base_location, :, None], np.stack([M_base['26'], -M_base['27']], axis=-1)[:, :, None]),
+                         terms(rows[..., 2], OT[:, base_location], -M_base['28'][:, :, None])],
+                 np.tile([GRB.LESS_EQUAL, GRB.GREATER_EQUAL, GRB.LESS_EQUAL], rows.size // 3), rhs,
+                 [family("26a.order_quantity_(base)_{},{},{}", rows[..., 0], axes=(spare_parts, bases, periods)),
+                  family("27.order_quantity_(base)_{},{},{}", rows[..., 1], axes=(spare_parts, bases, periods)),
+                  family("28a.order_quantity_(base)_{},{},{}", rows[..., 2], axes=(spare_parts, bases, periods))])
+
+        # Constraint 26 & 28 also for the mothervessels (26b and 28b added alternately)
+        rows = np.arange(n_parts * n_mvs * n_periods * 2).reshape(n_parts, n_mvs, n_periods, 2)
+        rhs = np.zeros(rows.shape)
+        rhs[..., 0] = (capacity[:, mv_location] + M_mv['26'])[:, :, None]
+        add_rows(model, table, [terms(rows, OQ[:, mv_location, :, None]),
+                         terms(rows[..., 0], IL[:, mv_location]),
+                         terms(rows, OT[:, mv_location, :, None], np.stack([M_mv['26'], -M_mv['28']], axis=-1)[:, :, None])],
+                 GRB.LESS_EQUAL, rhs,
+                 [family("26b.order_quantity_(mv)_{},{},{}", rows[..., 0], axes=(spare_parts, mother_vessels, periods)),
+                  family("28b.order_quantity_(mv)_{},{},{}", rows[..., 1], axes=(spare_parts, mother_vessels, periods))])
+
+    # Mothervessel extension: constraints 29 - 33
+    if components['mother_vessels']:
+        # Constraint 29: Bundles performed limited by total vessels in fleet
+        rows = np.arange(n_mvs * n_ctvs * n_periods).reshape(n_mvs, n_ctvs, n_periods)
+        add_rows(model, table, [terms(rows[mv_rank[n_e[at_mv]], n_v[at_mv], n_p[at_mv]], N[at_mv]),
+                         terms(rows[..., None], X_ctv.T[None, :, None, :], -1),
+                         terms(rows[..., None], np.transpose(CH_ctv, (1, 2, 0))[None], -1)],
+                 GRB.LESS_EQUAL, np.zeros(rows.shape), [family("29.tasks_performed_limit_{},{},{}", rows, axes=(mother_vessels, ctvessels, periods))])
+
+        # Constraint 30: Max one mothervessel per type
+        rows = np.arange(n_mvs * len(charter_periods)).reshape(n_mvs, -1)
+        add_rows(model, table, [terms(rows[..., None], X_mv.T[:, None, :]),
+                         terms(rows[..., None], np.transpose(CH[:, mv_vessel], (1, 2, 0)))],
+                 GRB.LESS_EQUAL, np.ones(rows.shape), [family("30.mother_vessel_limit_{},{}", rows, axes=(mother_vessels, charter_periods))])
+
+        # Constraint 31: Mothervessel docking capacity
+        rows = np.arange(n_mvs * n_ctvs * n_periods).reshape(n_mvs, n_ctvs, n_periods)
+        add_rows(model, table, [terms(rows[mv_rank[n_e[at_mv]], n_v[at_mv], n_p[at_mv]], N[at_mv]),
+                         terms(rows, MVO[:, None, :], -store['max_capacity_for_docking'][mv_location][:, None, None])],
+                 GRB.LESS_EQUAL, np.zeros(rows.shape),
+                 [family("31.mothervessel_docking_capacity_{0},{2}", rows, axes=(mother_vessels, ctvessels, periods))])
+
+        # Constraint 32: Mothervessel maximum time offshore
+        entries, rhs, keys = [], [], []
+        for j, e in enumerate(mother_vessels):
+            max_periods_offshore = int(max_time_offshore[e]/24)
+            starts = np.arange(1, periods[-1]+1 - max_periods_offshore) - 1
+            rows = len(rhs) + np.arange(len(starts))
+            entries.append(terms(rows[:, None], MVO[j, starts[:, None] + np.arange(max_periods_offshore + 1)]))
+            rhs.extend([max_periods_offshore] * len(starts))
+            keys.extend((e, p) for p in range(1, periods[-1]+1 - max_periods_offshore))
+        add_rows(model, table, entries, GRB.LESS_EQUAL, rhs,
+                 [family("32.mothervessel_max_time_offshore_{},{}", np.arange(len(rhs)), keys=keys)])
+
+        # Constraint 33: Mothervessel offshore status
+        rows = np.arange(n_mvs * n_periods).reshape(n_mvs, n_periods)
+        add_rows(model, table, [terms(rows, MVO), terms(rows[..., None], X_mv.T[:, None, :], -1),
+                         terms(rows[..., None], np.transpose(CH_mv, (1, 2, 0)), -1)],
+                 GRB.LESS_EQUAL, np.zeros(rows.shape), [family("33.mothervessel_offshore_status_{},{}", rows, axes=(mother_vessels, periods))])
+
+    # Inventory extension at the mothervessels: constraints 34 - 39
+    if components['inventory']:
+        # Constraints 34 - 37: Auxiliary variables linking purchased and chartered vessels with their bases for order quantity and inventory level
+        aux_names = {"34": "lambda_P", "35": "lambda_CH", "36": "mu_P", "37": "mu_CH"}
+        if options['indicator_formulation'] == 'indicator':
+            for s in spare_parts:
+                for e in bases:
+                    for v in mother_vessels:
+                        purchased = purchased_vessels[e, v]
+                        for p in periods:
+                            chartered = chartered_vessels[e, v, charter_period_of[p]]
+                            order = order_quantity[s, v, p]
+                            inventory = inventory_level[s, e, p]
+                            for name, binvar, aux, linked in [("34", purchased, lambda_P, order), ("35", chartered, lambda_CH, order),
+                                                              ("36", purchased, mu_P, inventory), ("37", chartered, mu_CH, inventory)]:
+                                aux_var = aux[s, e, v, p]
+                                model.addGenConstrIndicator(binvar, 1, LinExpr([1.0, -1.0], [aux_var, linked]), GRB.EQUAL, 0, name=f"{name}a.aux_var_{aux_names[name]}_{s},{e},{v},{p}" if table['names'] else "")
+                                model.addGenConstrIndicator(binvar, 0, LinExpr([1.0], [aux_var]), GRB.EQUAL, 0, name=f"{name}b.aux_var_{aux_names[name]}_{s},{e},{v},{p}" if table['names'] else "")
+            n = n_parts * n_bases * n_mvs * n_periods
+            register(table, 'general', 8 * n, [family(f"{name}{half}.aux_var_{aux_name}_{{}},{{}},{{}},{{}}", 8 * np.arange(n) + 2 * i + j,
+                                                      axes=(spare_parts, bases, mother_vessels, periods))
+                                               for i, (name, aux_name) in enumerate(aux_names.items()) for j, half in enumerate("ab")])
+        else:
+            # Linear rows with the smallest big-M, see model.constraints.add_constraints()
+            linear_big_m = indicator_big_m(sets, params)
+            product = options['indicator_formulation'] == 'product'
+            if product:
+                DP = var_index(vars['mv_purchased'], bases, mother_vessels)
+                DCH = var_index(vars['mv_chartered'], bases, mother_vessels, charter_periods)
+                rows = np.arange(DP.size).reshape(DP.shape)
+                add_rows(model, table, [terms(rows, DP), terms(rows, X_mv, -1)], GRB.EQUAL, np.zeros(DP.size),
+                         [family("34d.mothervessel_purchased_binary_{},{}", rows, axes=(bases, mother_vessels))])
+                rows = np.arange(DCH.size).reshape(DCH.shape)
+                add_rows(model, table, [terms(rows, DCH), terms(rows, CH[:, mv_vessel], -1)], GRB.EQUAL, np.zeros(DCH.size),
+                         [family("35d.mothervessel_chartered_binary_{},{},{}", rows, axes=(bases, mother_vessels, charter_periods))])
+                purchased, chartered = DP, DCH[:, :, charter_position]
+            else:
+                purchased, chartered = X_mv, CH_mv
+            purchased = np.broadcast_to(purchased[:, :, None], chartered.shape)
+            # Per (spare part, base, mothervessel, period) the rows a (<=), b (<=) and c (>=) of 34, 35, 36 and 37
+            rows = np.arange(n_parts * n_bases * n_mvs * n_periods * 12).reshape(n_parts, n_bases, n_mvs, n_periods, 4, 3)
+            MUP = var_index(mu_P, spare_parts, bases, mother_vessels, periods)
+            MUCH = var_index(mu_CH, spare_parts, bases, mother_vessels, periods)
+            aux = np.stack([LP, LCH, MUP, MUCH], axis=-1)
+            order = np.broadcast_to(OQ[:, None, mv_location], aux.shape[:-1])
+            inventory = np.broadcast_to(IL[:, base_location, None], aux.shape[:-1])
+            linked = np.stack([order, order, inventory, inventory], axis=-1)
+            binvar = np.stack([purchased, chartered, purchased, chartered], axis=-1)[None]
+            order_m = np.broadcast_to(linear_big_m['34'][:, None, :, None], aux.shape[:-1])
+            inventory_m = np.broadcast_to(linear_big_m['36'][:, :, None, None], aux.shape[:-1])
+            aux_big_m = np.stack([order_m, order_m, inventory_m, inventory_m], axis=-1)
+            binvar_coefs = np.array([0, -1, -1]) if product else np.array([1, -1, -1])
+            rhs = aux_big_m[..., None] * (np.array([0, 0, -1]) if product else np.array([1, 0, -1]))
+            add_rows(model, table, [terms(rows, aux[..., None]), terms(rows[..., [0, 2]], linked[..., None], -1),
+                                    terms(rows, binvar[..., None], aux_big_m[..., None] * binvar_coefs)],
+                     np.broadcast_to(np.array([GRB.LESS_EQUAL, GRB.LESS_EQUAL, GRB.GREATER_EQUAL]), rows.shape).ravel(), rhs,
+                     [family(f"{name}{half}.aux_var_{aux_name}_{{}},{{}},{{}},{{}}", rows[..., i, j], axes=(spare_parts, bases, mother_vessels, periods))
+                      for i, (name, aux_name) in enumerate(aux_names.items()) for j, half in enumerate("abc")])
+
+        # Constraint 38: No inventory when no mothervessel use & Constraint 39: No order quantity when no mothervessel use
+        rows = np.arange(n_parts * n_mvs * n_periods * 2).reshape(n_parts, n_mvs, n_periods, 2)
+        mv_big_m = np.stack([M_mv['38'], M_mv['39']], axis=-1)[:, :, None, :, None]
+        add_rows(model, table, [terms(rows[..., 0], IL[:, mv_location]), terms(rows[..., 1], OQ[:, mv_location]),
+                         terms(rows[..., None], X_mv.T[None, :, None, None, :], -mv_big_m),
+                         terms(rows[..., None], np.transpose(CH_mv, (1, 2, 0))[None, :, :, None, :], -mv_big_m)],
+                 GRB.LESS_EQUAL, np.zeros(rows.shape),
+                 [family("38.no_inventory_when_no_mothervessel_use_{},{},{}", rows[..., 0], axes=(spare_parts, mother_vessels, periods)),
+                  family("39.no_order_quantity_when_no_mothervessel_use_{},{},{}", rows[..., 1], axes=(spare_parts, mother_vessels, periods))])
+
+    model._constraint_table = table
+    model.update()
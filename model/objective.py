@@ -1,11 +1,19 @@
 from gurobipy import *
 from utils.utils import unpack_sets, unpack_parameters, unpack_variables
+from model.components import model_components
+from model.options import create_options
+from model.variables import aggregate_hours_spent
+
+def add_objective_function(model, sets, params, vars, options=None):
+    if options is None:
+        options = create_options()
 
-def add_objective_function(model, sets, params, vars):
     # Unpack sets
     (bases, vessels, periods, charter_dict, charter_periods, tasks, vessel_task_compatibility,
      prev_tasks, corr_tasks, planned_prev_tasks, planned_corr_tasks, bundle_dict, bundles, spare_parts,
      mother_vessels, ctvessels, locations) = unpack_sets(sets)
+    # Sparse support of task_performed and hours_spent, see model.sets
+    compatible_ctvessels, compatible_tasks = sets['compatible_ctvessels'], sets['compatible_tasks']
 
     # Unpack parameters
     (cost_base_operation, cost_vessel_purchase, cost_vessel_charter,
@@ -18,26 +26,36 @@ def add_objective_function(model, sets, params, vars):
      tasks_in_bundles, technicians_required_bundle, weather_max_time_offshore,
      order_cost, lead_time, holding_cost, parts_required, max_part_capacity,
      reorder_level, big_m, max_capacity_for_docking,
-     additional_time, tech_standby_cost, initial_inventory) = unpack_parameters(params)
+     additional_time, tech_standby_cost, initial_inventory, feasible_bundles,
+     charter_period_of, corrective_failures, cumulative_corrective_failures, store) = unpack_parameters(params)
 
     # Unpack variables
     (base_use, purchased_vessels, chartered_vessels, task_performed,
      bundle_performed, tasks_late, tasks_not_performed,
      periods_late, hours_spent, inventory_level, order_quantity,
      order_trigger, mv_offshore, lambda_P, lambda_CH, mu_P, mu_CH) = unpack_variables(vars)
+    if options['time_spent_formulation'] == 'aggregate':
+        hours_spent = aggregate_hours_spent(task_performed, time_to_perform_task)
 
 
     # Objective function
     obj_cost_bases = quicksum(cost_base_operation[b] * base_use[b] for b in bases)
     obj_cost_purchase_vessel = quicksum(cost_vessel_purchase[v] * purchased_vessels[b, v] for v in vessels for b in bases)
     obj_cost_charter_vessel = quicksum(cost_vessel_charter[(v, p)] * chartered_vessels[b, v, p] for v in vessels for b in bases for p in charter_periods)
-    obj_cost_operations = quicksum(hours_spent[e, v, p, m] * (cost_vessel_operation[v] + cost_technicians * technicians_required_task[m]) for e in locations for v in ctvessels for p in periods for m in tasks)
-    obj_cost_downtime_preventive = quicksum(cost_downtime[p] * time_to_perform_task[m] * task_performed[e, v, p, m] for e in locations for v in ctvessels for p in periods for m in prev_tasks)
-    obj_cost_downtime_corrective = quicksum(cost_downtime[p] * (task_performed[e, v, p, m] * (distance_base_OWF[e]/vessel_speed[v] + 2 * transfer_time[v] + time_to_perform_task[m]) + periods_late[p, m]*24) for e in locations for v in ctvessels for p in periods for m in corr_tasks) #multiply with 24 because cost is per hour
+    obj_cost_operations = quicksum(hours_spent[e, v, p, m] * (cost_vessel_operation[v] + cost_technicians * technicians_required_task[m]) for e in locations for v in ctvessels for p in periods for m in compatible_tasks[v])
+    obj_cost_downtime_preventive = quicksum(cost_downtime[p] * time_to_perform_task[m] * task_performed[e, v, p, m] for e in locations for v in ctvessels for p in periods for m in prev_tasks if m in compatible_tasks[v])
+    # The periods late are counted for every location and ctvessel, also the ones not compatible with the task
+    obj_cost_downtime_corrective = quicksum(cost_downtime[p] * task_performed[e, v, p, m] * (distance_base_OWF[e]/vessel_speed[v] + 2 * transfer_time[v] + time_to_perform_task[m]) for e in locations for v in ctvessels for p in periods for m in corr_tasks if m in compatible_tasks[v]) + quicksum(cost_downtime[p] * periods_late[p, m]*24 for e in locations for v in ctvessels for p in periods for m in corr_tasks) #multiply with 24 because cost is per hour
     obj_cost_penalty_late = quicksum(penalty_preventive_late * tasks_late[m] for m in prev_tasks)
     obj_cost_penalty_not_performed = quicksum(penalty_not_performed * tasks_not_performed[m] for m in tasks)
-    obj_spare_parts_cost = quicksum(holding_cost[s, e] * inventory_level[s, e, p] for s in spare_parts for e in locations for p in periods) + quicksum(order_cost[s] * order_quantity[s, e, p] for s in spare_parts for e in bases for p in periods)
-    obj_cost_mv_operations = quicksum(cost_vessel_operation[v] * mv_offshore[v, p] for v in mother_vessels for p in periods)
+    # Costs of the extensions, only for the components in the model
+    components = model_components(sets, options)
+    obj_spare_parts_cost = 0
+    if components['inventory']:
+        obj_spare_parts_cost = quicksum(holding_cost[s, e] * inventory_level[s, e, p] for s in spare_parts for e in locations for p in periods) + quicksum(order_cost[s] * order_quantity[s, e, p] for s in spare_parts for e in bases for p in periods)
+    obj_cost_mv_operations = 0
+    if components['mother_vessels']:
+        obj_cost_mv_operations = quicksum(cost_vessel_operation[v] * mv_offshore[v, p] for v in mother_vessels for p in periods)
 
     model.setObjective(
         obj_cost_bases
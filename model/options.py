@@ -0,0 +1,111 @@
+# Default model and solution options, see create_options()
+DEFAULT_OPTIONS = {
+    # Constraint 16: 'carry_over' keeps the carry-over hours of each task in a running variable per period,
+    # 'nested' sums all earlier periods in every row (original formulation, quadratic in the horizon), 'aggregate'
+    # has no hours_spent variables and no rows, the hours are the task time of the tasks performed
+    'time_spent_formulation': 'carry_over',
+    # Constraint 13: 'backlog' bounds the tasks performed in a period by the failures in that period plus the
+    # backlog of the previous period (periods_late), 'nested' sums all earlier periods in every row (original)
+    'corrective_precedence_formulation': 'backlog',
+    # Constraints: 'matrix' adds every family at once as a sparse matrix, 'loop' adds them row by row with
+    # quicksum (original builder). Both give the identical model
+    'constraint_builder': 'matrix',
+    # Replace the constraints that are bounds or fixings (7 and 21) by variable bounds, see model.reduction
+    'reduce_model': True,
+    # Name every constraint while building. Without names the matrix builder keeps a side table of the constraint
+    # families instead, see model.constraint_table; the names are restored on demand (e.g. before an IIS)
+    'constraint_names': True,
+    # Constraints 17 and 34 - 37: 'indicator' adds them as indicator constraints (original), 'big_m' as linear rows
+    # with the smallest big-M of each row (see model.big_m), 'product' links the purchased and chartered mothervessels
+    # to binary copies and writes 34 - 37 as the exact linearization of the products (17 as in 'big_m')
+    'indicator_formulation': 'indicator',
+    # Big-M of the constraints 19, 22 - 28, 38 and 39: 'tight' uses the smallest M of each constraint (see
+    # model.big_m), 'global' the single constant params['big_m'] (original)
+    'big_m': 'tight',
+    # Spare parts inventory (constraints 17 - 28 and 34 - 39), False leaves it out, e.g. for quick fleet screening.
+    # It is only included when the scenario has spare parts, see model.components
+    'inventory_extension': True,
+    # Mothervessels as offshore locations (constraints 29 - 33), False leaves the mothervessels out of the sets
+    # (model.sets.create_sets), as in a scenario without mothervessels
+    'mothervessel_extension': True,
+    # GRASP: number of worker processes that evaluate fleets in parallel, each with its own copy of the model
+    # (see model.evaluation). 1 evaluates them one by one on the model itself
+    'evaluation_workers': 1,
+    # GRASP: Gurobi threads of all workers together, split evenly across the workers (0: Gurobi default)
+    'evaluation_threads': 0,
+    # GRASP: 'memory' solves every fleet only once per search, 'disk' also keeps the results in data/cache per
+    # instance (scenario, sets, parameters and model options), so repeated and restarted searches reuse them
+    'evaluation_cache': 'memory',
+    # GRASP: start the solve of a neighbour from the solution of the current fleet, with the dispatch at the
+    # bases and mothervessels that the move changes left to Gurobi (see model.evaluation.mip_start)
+    'evaluation_warm_start': True,
+    # GRASP: set the Cutoff of a neighbour to the best neighbour of the iteration so far, neighbours that cannot
+    # beat it are reported as dominated instead of solved to optimality
+    'evaluation_cutoff': True,
+    # GRASP: screen the neighbours by a lower bound before the full solves, 'lp' the LP relaxation, 'mip' the
+    # model with the time limit 'evaluation_screening_time'. They are solved in the order of their bounds and pruned
+    # when the bound is above the best neighbour of the iteration so far, 'none' solves all of them
+    'evaluation_screening': 'lp',
+    # GRASP: with screening, the number of neighbours with the lowest bounds that get a full solve (0: all)
+    'evaluation_top_k': 0,
+    # GRASP: time limit of the 'mip' screening of a neighbour (seconds)
+    'evaluation_screening_time': 1.0,
+    # GRASP construction of the vessel counts per type: 'marginal' adds vessels until one more does not lower the
+    # cost, 'bisection' searches that count by bisection, 'enumerate' evaluates every count (original)
+    'construction': 'marginal',
+    # GRASP construction: 0 chooses the best base and counts (greedy), alpha > 0 a random one of the restricted
+    # candidate list, the evaluated candidates within alpha times their objective range from the best
+    'construction_alpha': 0.0,
+    # GRASP construction: seed of the restricted candidate list, None for a random seed
+    'construction_seed': None,
+}
+
+# Allowed values of the options that select between formulations
+OPTION_VALUES = {
+    'time_spent_formulation': ('carry_over', 'nested', 'aggregate'),
+    'corrective_precedence_formulation': ('backlog', 'nested'),
+    'constraint_builder': ('matrix', 'loop'),
+    'reduce_model': (True, False),
+    'constraint_names': (True, False),
+    'indicator_formulation': ('indicator', 'big_m', 'product'),
+    'big_m': ('tight', 'global'),
+    'inventory_extension': (True, False),
+    'mothervessel_extension': (True, False),
+    'evaluation_cache': ('memory', 'disk', 'none'),
+    'evaluation_warm_start': (True, False),
+    'evaluation_cutoff': (True, False),
+    'evaluation_screening': ('none', 'lp', 'mip'),
+    'construction': ('marginal', 'bisection', 'enumerate'),
+}
+
+
+def create_options(**overrides):
+    """
+    Create the options for building and solving the model
+    :param overrides: Options that differ from DEFAULT_OPTIONS
+    :return: Dict with all options
+    """
+    unknown = [key for key in overrides if key not in DEFAULT_OPTIONS]
+    if unknown:
+        raise ValueError(f"Unknown options {unknown}, available options: {list(DEFAULT_OPTIONS)}")
+    for key, value in overrides.items():
+        if key in OPTION_VALUES and value not in OPTION_VALUES[key]:
+            raise ValueError(f"Invalid value {value!r} for option '{key}', choose from {OPTION_VALUES[key]}")
+
+    options = dict(DEFAULT_OPTIONS)
+    options.update(overrides)
+    if not isinstance(options['evaluation_workers'], int) or options['evaluation_workers'] < 1:
+        raise ValueError(f"Invalid value {options['evaluation_workers']!r} for option 'evaluation_workers', choose an integer >= 1")
+    if not isinstance(options['evaluation_threads'], int) or options['evaluation_threads'] < 0:
+        raise ValueError(f"Invalid value {options['evaluation_threads']!r} for option 'evaluation_threads', choose an integer >= 0")
+    if not isinstance(options['evaluation_top_k'], int) or options['evaluation_top_k'] < 0:
+        raise ValueError(f"Invalid value {options['evaluation_top_k']!r} for option 'evaluation_top_k', choose an integer >= 0")
+    if not isinstance(options['evaluation_screening_time'], (int, float)) or options['evaluation_screening_time'] <= 0:
+        raise ValueError(f"Invalid value {options['evaluation_screening_time']!r} for option 'evaluation_screening_time', choose a number > 0")
+    if not isinstance(options['construction_alpha'], (int, float)) or not 0 <= options['construction_alpha'] <= 1:
+        raise ValueError(f"Invalid value {options['construction_alpha']!r} for option 'construction_alpha', choose a number in [0, 1]")
+    if options['construction_seed'] is not None and not isinstance(options['construction_seed'], int):
+        raise ValueError(f"Invalid value {options['construction_seed']!r} for option 'construction_seed', choose an integer or None")
+    if not options['constraint_names'] and options['constraint_builder'] != 'matrix':
+        raise ValueError("Option constraint_names=False requires constraint_builder='matrix'")
+    return options
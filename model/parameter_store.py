@@ -0,0 +1,68 @@
+import itertools
+import numpy as np
+from utils.scenario import read_only
+
+# Sets that are registered in the index of the parameter store
+INDEXED_SETS = ['bases', 'vessels', 'periods', 'charter_periods', 'tasks', 'prev_tasks', 'corr_tasks', 'bundles',
+                'spare_parts', 'mother_vessels', 'ctvessels', 'locations']
+
+
+def create_index(sets):
+    """
+    Map every element of the sets to its position
+    :param sets: Sets
+    :return: Dict with for each set a dict {element: position}
+    """
+    return {name: {element: i for i, element in enumerate(sets[name])} for name in INDEXED_SETS}
+
+
+def positions(index, name, elements):
+    """
+    Positions of some elements within a set of the index, e.g. the bases within the locations
+    :param index: Index of the parameter store, see create_index()
+    :param name: Name of the set
+    :param elements: Elements of the set
+    :return: Array with the position of every element
+    """
+    return np.array([index[name][element] for element in elements], dtype=np.int64)
+
+
+def column(df, ids, name):
+    """
+    Return a column of a DataFrame as a read-only array ordered like the set elements
+    """
+    return read_only(df.loc[list(ids), name].to_numpy())
+
+
+def matrix(df, row_ids, col_ids):
+    """
+    Return a DataFrame matrix as a read-only array ordered like the set elements
+    """
+    return read_only(df.loc[list(row_ids), list(col_ids)].to_numpy())
+
+
+def dict_view(values, *axes):
+    """
+    String-keyed view of a parameter array, as used by the model builders
+    :param values: Array with one dimension per axis
+    :param axes: Set elements along each dimension
+    :return: Dict with the element (one axis) or tuple of elements (several axes) as key
+    """
+    values = np.asarray(values)
+    if len(axes) == 1:
+        return dict(zip(axes[0], values.tolist()))
+    return dict(zip(itertools.product(*axes), values.reshape(-1).tolist()))
+
+
+def charter_period_lookup(periods, charter_dict):
+    """
+    Charter period of each period, equal to return_charter_period() for every period
+    :return: Array with the charter period of each period
+    """
+    charter_period = np.zeros(len(periods), dtype=np.int64)
+    position = {p: i for i, p in enumerate(periods)}
+    for idx in reversed(range(len(charter_dict))):
+        for p in charter_dict[idx]:
+            if p in position:
+                charter_period[position[p]] = idx + 1
+    return read_only(charter_period)
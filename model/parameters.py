@@ -1,4 +1,7 @@
-from utils.utils import unpack_sets, generate_downtime_cost, generate_availability_set
+import numpy as np
+from utils.utils import unpack_sets, generate_downtime_cost_batch, generate_availability_matrix, generate_feasible_bundles
+from utils.scenario import read_only
+from model.parameter_store import create_index, column, matrix, dict_view, charter_period_lookup
 
 def create_parameters(data, sets, year):
     """
@@ -10,140 +13,132 @@ def create_parameters(data, sets, year):
      prev_tasks, corr_tasks, planned_prev_tasks, planned_corr_tasks, bundle_dict, bundles, spare_parts,
      mother_vessels, ctvessels, locations) = unpack_sets(sets)
 
-    # Set index for dataframes
-    data['bases'].set_index('SET', inplace=True)
-    data['vessels'].set_index('SET', inplace=True)
-    data['capacity_base_vessels'].set_index(data['capacity_base_vessels'].columns[0], inplace=True)
-    data['spare_parts'].set_index('SET', inplace=True)
-    data['spare_parts_required'].set_index(data['spare_parts_required'].columns[0], inplace=True)
-    data['holding_costs'].set_index(data['holding_costs'].columns[0], inplace=True)
-    data['max_capacity'].set_index(data['max_capacity'].columns[0], inplace=True)
-    data['reorder_level'].set_index(data['reorder_level'].columns[0], inplace=True)
-    data['locations'].set_index('SET', inplace=True)
+    # Dataframes indexed by their set elements
+    df_bases = data.table('bases')
+    df_vessels = data.table('vessels')
+    df_locations = data.table('locations')
+    df_tasks = data.table('tasks')
+    df_spare_parts = data.table('spare_parts')
+    df_capacity_base_vessels = data.matrix('capacity_base_vessels')
+    df_spare_parts_required = data.matrix('spare_parts_required')
+    df_holding_costs = data.matrix('holding_costs')
+    df_max_capacity = data.matrix('max_capacity')
+    df_reorder_level = data.matrix('reorder_level')
+
+    # Dense parameter store: every parameter as an array ordered like the set elements
+    store = {'index': create_index(sets)}
 
     # Cost Parameters
-    cost_base_operation = data['bases']['cost']
-    cost_vessel_purchase = data['vessels']['cost_purchase']
-    cost_vessel_charter = {
-        (v, p): data['vessels']['cost_charter_day'][v] * len(charter_dict[p-1])
-        for v in vessels for p in charter_periods
-    }
-    cost_vessel_operation = data['vessels']['cost_operation']                      # Hourly cost?
-    cost_technicians = data['general']['cost_technicians'].iloc[0]          # Hourly cost
-    cost_downtime = generate_downtime_cost(periods, year)
+    store['cost_base_operation'] = column(df_bases, bases, 'cost')
+    store['cost_vessel_purchase'] = column(df_vessels, vessels, 'cost_purchase')
+    store['cost_vessel_charter'] = read_only(np.outer(column(df_vessels, vessels, 'cost_charter_day'),
+                                                      [len(charter_dict[p-1]) for p in charter_periods]))
+    store['cost_vessel_operation'] = column(df_vessels, vessels, 'cost_operation')          # Hourly cost?
+    store['cost_technicians'] = data.general['cost_technicians']                            # Hourly cost
+    store['cost_downtime'] = read_only(generate_downtime_cost_batch(periods, [year])[0])
 
     # Penalty Parameters (implemented as cost parameters)
-    penalty_preventive_late = data['general']['penalty_cost_late'].iloc[0]                  # Cost per hour?
-    penalty_not_performed = data['general']['penalty_cost_not_performed'].iloc[0]           # Cost per hour?
+    store['penalty_preventive_late'] = data.general['penalty_cost_late']                    # Cost per hour?
+    store['penalty_not_performed'] = data.general['penalty_cost_not_performed']             # Cost per hour?
 
     # Vessel Parameters
-    vessel_speed = data['vessels']['speed'] * 1.852  # Convert from knots to km/h
-    transfer_time = data['vessels']['transfer_time']
-    max_time_offshore = data['vessels']['max_time_offshore']
-    max_vessels_available_charter = data['vessels']['available']                            # Remove?
+    store['vessel_speed'] = read_only(column(df_vessels, vessels, 'speed') * 1.852)        # Convert from knots to km/h
+    store['transfer_time'] = column(df_vessels, vessels, 'transfer_time')
+    store['max_time_offshore'] = column(df_vessels, vessels, 'max_time_offshore')
+    store['max_vessels_available_charter'] = column(df_vessels, vessels, 'available')       # Remove?
 
     # Base Parameters
-    distance_base_OWF = data['locations']['distance']
-    technicians_available = data['locations']['technicians_available']
+    store['distance_base_OWF'] = column(df_locations, locations, 'distance')
+    store['technicians_available'] = column(df_locations, locations, 'technicians_available')
 
     # Capacity Parameters
-    capacity_base_for_vessels = {
-        (b, v): data['capacity_base_vessels'].at[b, v]
-        for b in bases for v in vessels
-    }
-    capacity_vessel_for_technicians = data['vessels']['tech_cap']
+    store['capacity_base_for_vessels'] = matrix(df_capacity_base_vessels, bases, vessels)
+    store['capacity_vessel_for_technicians'] = column(df_vessels, vessels, 'tech_cap')
 
     # Maintenance Task Parameters
-    failure_rate = data['tasks']['failure_rate']
-    time_to_perform_task = data['tasks']['active_time']
-    technicians_required_task = data['tasks']['technicians']
-    latest_period_to_perform_task = data['general']['latest_period'].iloc[0]            # Last period to perform a preventive task w/o penalty
+    store['failure_rate'] = column(df_tasks, tasks, 'failure_rate')
+    store['time_to_perform_task'] = column(df_tasks, tasks, 'active_time')
+    store['technicians_required_task'] = column(df_tasks, tasks, 'technicians')
+    store['latest_period_to_perform_task'] = data.general['latest_period']                  # Last period to perform a preventive task w/o penalty
 
     # Maintenance Bundle Parameters
-    tasks_in_bundles = {}
-    for k, task_combo in bundle_dict.items():
-        for m in tasks:
-            tasks_in_bundles[m, k] = task_combo.count(m)
-
-    technicians_required_bundle = {
-        k: sum(technicians_required_task[m] for m in bundle_dict[k])
-        for k in bundles
-    }
+    store['tasks_in_bundles'] = read_only([[bundle_dict[k].count(m) for k in bundles] for m in tasks])
+    store['tasks_in_bundles'] = store['tasks_in_bundles'].reshape(len(tasks), len(bundles))
+    store['technicians_required_bundle'] = read_only(store['technicians_required_task'] @ store['tasks_in_bundles'])
 
     # Weather Parameter
-    weather_max_time_offshore = generate_availability_set(vessels, periods, year, data)
+    store['weather_max_time_offshore'] = read_only(generate_availability_matrix(vessels, periods, year, data))
 
     # Spare Parts Parameters
-    order_cost = data['spare_parts']['order_cost']
-    lead_time = data['spare_parts']['lead_time']
-    holding_cost = {
-        (s, e): data['holding_costs'].at[s, e]
-        for s in spare_parts for e in locations
-    }
-    parts_required = {
-        (m, s): data['spare_parts_required'].at[s, m]
-        for s in spare_parts for m in tasks
-    }
-    max_part_capacity = {
-        (s, e): data['max_capacity'].at[s, e]
-        for s in spare_parts for e in locations
-    }
-    reorder_level = {
-        (s, e): data['reorder_level'].at[s, e]
-        for s in spare_parts for e in locations
-    }
-    initial_inventory = data['locations']['initial_inventory']
+    store['order_cost'] = column(df_spare_parts, spare_parts, 'order_cost')
+    store['lead_time'] = column(df_spare_parts, spare_parts, 'lead_time')
+    store['holding_cost'] = matrix(df_holding_costs, spare_parts, locations)
+    store['parts_required'] = read_only(matrix(df_spare_parts_required, spare_parts, tasks).T)
+    store['max_part_capacity'] = matrix(df_max_capacity, spare_parts, locations)
+    store['reorder_level'] = matrix(df_reorder_level, spare_parts, locations)
+    store['initial_inventory'] = column(df_locations, locations, 'initial_inventory')
 
     # Big-M parameter
-    max_capacity = []
-    for s in spare_parts:
-        for e in locations:
-            max_capacity.append(max_part_capacity[s, e])
     # big_M = 10000
-    big_M = max(max_capacity)*100  # Use the maximum capacity as Big-M
-
+    store['big_m'] = store['max_part_capacity'].max().item()*100  # Use the maximum capacity as Big-M
 
     # Mother Vessel Parameters
-    max_capacity_for_docking = data['locations']['max_capacity_for_docking']
-    additional_time = data['vessels']['additional_time']                # additional hours for CTVs when docking at mother vessel
-    tech_standby_cost = data['general']['tech_standby_cost'].iloc[0]  # Cost per hour for technicians on standby
+    store['max_capacity_for_docking'] = column(df_locations, locations, 'max_capacity_for_docking')
+    store['additional_time'] = column(df_vessels, vessels, 'additional_time')             # additional hours for CTVs when docking at mother vessel
+    store['tech_standby_cost'] = data.general['tech_standby_cost']                        # Cost per hour for technicians on standby
 
-    # Create the parameters dictionary
+    # Precomputed lookups: charter period of each period and the (cumulative) corrective failures per period
+    store['charter_period_of'] = charter_period_lookup(periods, charter_dict)
+    store['corrective_failures'] = read_only(planned_corr_tasks.to_numpy(dtype=np.int64).reshape(len(corr_tasks), len(periods)))
+    store['cumulative_corrective_failures'] = read_only(np.concatenate(
+        [np.zeros((len(corr_tasks), 1), dtype=np.int64), np.cumsum(store['corrective_failures'], axis=1)], axis=1))
+
+    # Create the parameters dictionary, string-keyed views of the parameter store
     params = {
-        'cost_base_operation': cost_base_operation,
-        'cost_vessel_purchase': cost_vessel_purchase,
-        'cost_vessel_charter': cost_vessel_charter,
-        'cost_vessel_operation': cost_vessel_operation,
-        'cost_technicians': cost_technicians,
-        'cost_downtime': cost_downtime,
-        'penalty_preventive_late': penalty_preventive_late,
-        'penalty_not_performed': penalty_not_performed,
-        'vessel_speed': vessel_speed,
-        'transfer_time': transfer_time,
-        'max_time_offshore': max_time_offshore,
-        'max_vessels_available_charter': max_vessels_available_charter,
-        'distance_base_OWF': distance_base_OWF,
-        'technicians_available': technicians_available,
-        'capacity_base_for_vessels': capacity_base_for_vessels,
-        'capacity_vessel_for_technicians': capacity_vessel_for_technicians,
-        'failure_rate': failure_rate,
-        'time_to_perform_task': time_to_perform_task,
-        'technicians_required_task': technicians_required_task,
-        'latest_period_to_perform_task': latest_period_to_perform_task,
-        'tasks_in_bundles': tasks_in_bundles,
-        'technicians_required_bundle': technicians_required_bundle,
-        'weather_max_time_offshore': weather_max_time_offshore,
-        'order_cost': order_cost,
-        'lead_time': lead_time,
-        'holding_cost': holding_cost,
-        'parts_required': parts_required,
-        'max_part_capacity': max_part_capacity,
-        'reorder_level': reorder_level,
-        'big_m': big_M,
-        'max_capacity_for_docking': max_capacity_for_docking,
-        'additional_time': additional_time,
-        'tech_standby_cost': tech_standby_cost,
-        'initial_inventory': initial_inventory
+        'cost_base_operation': dict_view(store['cost_base_operation'], bases),
+        'cost_vessel_purchase': dict_view(store['cost_vessel_purchase'], vessels),
+        'cost_vessel_charter': dict_view(store['cost_vessel_charter'], vessels, charter_periods),
+        'cost_vessel_operation': dict_view(store['cost_vessel_operation'], vessels),
+        'cost_technicians': store['cost_technicians'],
+        'cost_downtime': dict_view(store['cost_downtime'], periods),
+        'penalty_preventive_late': store['penalty_preventive_late'],
+        'penalty_not_performed': store['penalty_not_performed'],
+        'vessel_speed': dict_view(store['vessel_speed'], vessels),
+        'transfer_time': dict_view(store['transfer_time'], vessels),
+        'max_time_offshore': dict_view(store['max_time_offshore'], vessels),
+        'max_vessels_available_charter': dict_view(store['max_vessels_available_charter'], vessels),
+        'distance_base_OWF': dict_view(store['distance_base_OWF'], locations),
+        'technicians_available': dict_view(store['technicians_available'], locations),
+        'capacity_base_for_vessels': dict_view(store['capacity_base_for_vessels'], bases, vessels),
+        'capacity_vessel_for_technicians': dict_view(store['capacity_vessel_for_technicians'], vessels),
+        'failure_rate': dict_view(store['failure_rate'], tasks),
+        'time_to_perform_task': dict_view(store['time_to_perform_task'], tasks),
+        'technicians_required_task': dict_view(store['technicians_required_task'], tasks),
+        'latest_period_to_perform_task': store['latest_period_to_perform_task'],
+        'tasks_in_bundles': dict_view(store['tasks_in_bundles'], tasks, bundles),
+        'technicians_required_bundle': dict_view(store['technicians_required_bundle'], bundles),
+        'weather_max_time_offshore': dict_view(store['weather_max_time_offshore'], vessels, periods),
+        'order_cost': dict_view(store['order_cost'], spare_parts),
+        'lead_time': dict_view(store['lead_time'], spare_parts),
+        'holding_cost': dict_view(store['holding_cost'], spare_parts, locations),
+        'parts_required': dict_view(store['parts_required'], tasks, spare_parts),
+        'max_part_capacity': dict_view(store['max_part_capacity'], spare_parts, locations),
+        'reorder_level': dict_view(store['reorder_level'], spare_parts, locations),
+        'big_m': store['big_m'],
+        'max_capacity_for_docking': dict_view(store['max_capacity_for_docking'], locations),
+        'additional_time': dict_view(store['additional_time'], vessels),
+        'tech_standby_cost': store['tech_standby_cost'],
+        'initial_inventory': dict_view(store['initial_inventory'], locations),
+        'charter_period_of': dict_view(store['charter_period_of'], periods),
+        'corrective_failures': dict_view(store['corrective_failures'], corr_tasks, periods),
+        'cumulative_corrective_failures': dict_view(store['cumulative_corrective_failures'], corr_tasks, [0] + periods),
+        'store': store
     }
 
-    return params
\ No newline at end of file
+    # Bundles that fit in the time offshore of each CTV, per location and period
+    params['feasible_bundles'] = generate_feasible_bundles(locations, bases, mother_vessels, ctvessels, periods, bundle_dict,
+                                                           params['max_time_offshore'], params['transfer_time'],
+                                                           params['distance_base_OWF'], params['vessel_speed'],
+                                                           params['weather_max_time_offshore'])
+
+    return params
@@ -0,0 +1,80 @@
+from gurobipy import *
+from utils.utils import unpack_sets, unpack_parameters
+from model.components import model_components
+
+
+def find_reductions(sets, params, options=None):
+    """
+    Find the constraints that are variable bounds or fixings rather than rows
+    - Constraint 7: a bundle that needs more technicians than the CTV can carry is never performed, so its
+      variable is not created. For all other bundles the row is always satisfied.
+    - Constraint 21: the maximum part capacity is an upper bound of inventory_level (inventory extension only)
+    Constraint 10 (vessel-task compatibility) has no rows at all, task_performed only exists for the compatible
+    ctvessels (model.variables)
+    :param sets: Sets
+    :param params: Parameters
+    :param options: Model options, see model.options
+    :return: Dict with the reduced feasible bundles, the upper bounds and the number of rows and columns removed
+    """
+    # Unpack sets
+    (bases, vessels, periods, charter_dict, charter_periods, tasks, vessel_task_compatibility,
+     prev_tasks, corr_tasks, planned_prev_tasks, planned_corr_tasks, bundle_dict, bundles, spare_parts,
+     mother_vessels, ctvessels, locations) = unpack_sets(sets)
+
+    # Unpack parameters
+    (cost_base_operation, cost_vessel_purchase, cost_vessel_charter,
+     cost_vessel_operation, cost_technicians, cost_downtime,
+     penalty_preventive_late, penalty_not_performed, vessel_speed,
+     transfer_time, max_time_offshore, max_vessels_available_charter,
+     distance_base_OWF, technicians_available, capacity_base_for_vessels,
+     capacity_vessel_for_technicians, failure_rate, time_to_perform_task,
+     technicians_required_task, latest_period_to_perform_task,
+     tasks_in_bundles, technicians_required_bundle, weather_max_time_offshore,
+     order_cost, lead_time, holding_cost, parts_required, max_part_capacity,
+     reorder_level, big_m, max_capacity_for_docking,
+     additional_time, tech_standby_cost, initial_inventory, feasible_bundles,
+     charter_period_of, corrective_failures, cumulative_corrective_failures, store) = unpack_parameters(params)
+
+    # Constraint 7: only the bundles within the technician capacity of the CTV
+    reduced_bundles = {(e, v, p): [k for k in feasible if technicians_required_bundle[k] <= capacity_vessel_for_technicians[v]]
+                       for (e, v, p), feasible in feasible_bundles.items()}
+    n_bundles = sum(len(feasible) for feasible in feasible_bundles.values())
+    n_reduced_bundles = sum(len(feasible) for feasible in reduced_bundles.values())
+
+    # Constraint 21: maximum part capacity
+    inventory_bounds = {}
+    if model_components(sets, options)['inventory']:
+        inventory_bounds = {(s, e, p): max_part_capacity[s, e] for s in spare_parts for e in locations for p in periods}
+
+    return {
+        'feasible_bundles': reduced_bundles,
+        'inventory_level_ub': inventory_bounds,
+        'rows_removed': {'7': n_bundles, '21': len(inventory_bounds)},
+        'columns_removed': {'bundle_performed': n_bundles - n_reduced_bundles},
+    }
+
+
+def apply_reductions(model, vars, reductions):
+    """
+    Set the variable bounds that replace the removed rows
+    :param model: Gurobi model
+    :param vars: Variables
+    :param reductions: Reductions, see find_reductions()
+    """
+    inventory_level = vars['inventory_level']
+    if reductions['inventory_level_ub']:
+        bounded = [inventory_level[key] for key in reductions['inventory_level_ub']]
+        model.setAttr(GRB.Attr.UB, bounded, [min(var.UB, ub) for var, ub in zip(bounded, reductions['inventory_level_ub'].values())])
+
+
+def print_reductions(reductions):
+    """
+    Print how many rows and columns the reduction removed
+    :param reductions: Reductions, see find_reductions()
+    """
+    rows = reductions['rows_removed']
+    columns = reductions['columns_removed']
+    print(f"Model reduction: removed {sum(rows.values())} rows "
+          f"({', '.join(f'constraint {c}: {n}' for c, n in rows.items())}) "
+          f"and {sum(columns.values())} columns ({', '.join(f'{v}: {n}' for v, n in columns.items())}), "
+          f"bounded {len(reductions['inventory_level_ub'])} inventory_level")
@@ -1,37 +1,63 @@
 from utils.utils import *
+from model.options import create_options
 
 
-def create_sets(data):
+def create_sets(data, seed=None, corrective_failures=None, options=None):
     """
     Create the model sets
+    :param data: Scenario with the input data
+    :param seed: Seed of the corrective failure generator, None for a random seed
+    :param corrective_failures: Optional (tasks, periods) array with the corrective failures to use,
+                                e.g. one scenario of generate_corrective_failures
+    :param options: Model options, without the mothervessel extension the mothervessels are left out of the
+                    vessels and locations
     """
-    turbines = int(data['general']['turbines'].iloc[0])
+    if options is None:
+        options = create_options()
+    turbines = int(data.general['turbines'])
 
     sets={}
 
-    bases = data['bases']['SET'].tolist()
-    tasks = data['tasks']['SET'].tolist()
+    bases = data.ids('bases')
+    tasks = data.ids('tasks')
 
-    periods = list(range(1, int(data['general']['planning_horizon'].iloc[0]) + 1))
-    charter_dict = list(periods[i:i+30] for i in range(0, len(periods), data['general']['charter_period'].iloc[0]))             #Dict with all the periods p ordered into the charter periods
-    charter_periods = list(range(1, int(data['general']['planning_horizon'].iloc[0] / data['general']['charter_period'].iloc[0]) + 1))
+    periods = list(range(1, int(data.general['planning_horizon']) + 1))
+    charter_dict = list(periods[i:i+30] for i in range(0, len(periods), data.general['charter_period']))             #Dict with all the periods p ordered into the charter periods
+    charter_periods = list(range(1, int(data.general['planning_horizon'] / data.general['charter_period']) + 1))
 
-    vessels = data['vessels']['SET'].tolist()
-    vessel_task_compatibility = {m: [v for v in vessels if data['task_compatibility'].at[m, v] == 1] for m in tasks}
+    df_vessels = data.table('vessels')
+    vessels = data.ids('vessels')
+    if not options['mothervessel_extension']:
+        vessels = [v for v in vessels if df_vessels.at[v, 'MV'] != 1]
+    task_compatibility = data.matrix('task_compatibility')
+    vessel_task_compatibility = {m: [v for v in vessels if task_compatibility.at[m, v] == 1] for m in tasks}
 
-    data['tasks'].set_index('SET', inplace=True)
-    prev_tasks = data['tasks'][data['tasks']['PRE/COR'] == 'PRE'].index.tolist()
-    corr_tasks = data['tasks'][data['tasks']['PRE/COR'] == 'COR'].index.tolist()
-    planned_prev_tasks = {m: turbines * int(data['tasks'].at[m, 'preventive_rate']) for m in prev_tasks}
-    planned_corr_tasks = generate_corrective_maintenance_tasks(corr_tasks, periods, turbines, data['tasks'])
-    bundle_dict = generate_task_bundles(tasks)      # This is a dict with all bundles as values and 'bundle_ids' as keys
-    bundles = list(bundle_dict.keys())              # This is a list of all bundle_ids
+    df_tasks = data.table('tasks')
+    prev_tasks = df_tasks[df_tasks['PRE/COR'] == 'PRE'].index.tolist()
+    corr_tasks = df_tasks[df_tasks['PRE/COR'] == 'COR'].index.tolist()
+    planned_prev_tasks = {m: turbines * int(df_tasks.at[m, 'preventive_rate']) for m in prev_tasks}
+    if corrective_failures is None:
+        planned_corr_tasks = generate_corrective_maintenance_tasks(corr_tasks, periods, turbines, df_tasks, seed)
+    else:
+        planned_corr_tasks = corrective_tasks_view(corrective_failures, corr_tasks, periods)
 
     # Extension sets
-    spare_parts = data['spare_parts']['SET'].tolist()
-    mother_vessels = data['vessels'].loc[data['vessels']['MV'] == 1, 'SET'].tolist()
+    spare_parts = data.ids('spare_parts')
+    mother_vessels = [v for v in df_vessels.index[df_vessels['MV'] == 1].tolist() if v in vessels]
     ctvessels = [v for v in vessels if v not in mother_vessels]  # All vessels that are not mother vessels
-    locations = data['locations']['SET'].tolist()
+    locations = [e for e in data.ids('locations') if e not in data.ids('vessels') or e in mother_vessels]
+
+    # Sparse support of task_performed and hours_spent: the ctvessels compatible with each task and the reverse
+    compatible_ctvessels = {m: [v for v in ctvessels if v in vessel_task_compatibility[m]] for m in tasks}
+    compatible_tasks = {v: [m for m in tasks if v in vessel_task_compatibility[m]] for v in ctvessels}
+
+    # Bundles that no CTV can perform, due to its technician capacity or time capacity offshore, are left out
+    bundle_dict = generate_task_bundles(tasks,
+                                        technicians_required=df_tasks['technicians'],
+                                        max_technicians=df_vessels.loc[ctvessels, 'tech_cap'].max() if ctvessels else 0,
+                                        max_time_offshore=df_vessels.loc[ctvessels, 'max_time_offshore'].to_numpy(),
+                                        transfer_time=df_vessels.loc[ctvessels, 'transfer_time'].to_numpy())      # This is a dict with all bundles as values and 'bundle_ids' as keys
+    bundles = list(bundle_dict.keys())              # This is a list of all bundle_ids
 
     #Create the sets dictionary
     sets['bases'] = bases
@@ -51,5 +77,7 @@ def create_sets(data):
     sets['mother_vessels'] = mother_vessels
     sets['ctvessels'] = ctvessels
     sets['locations'] = locations
+    sets['compatible_ctvessels'] = compatible_ctvessels
+    sets['compatible_tasks'] = compatible_tasks
 
     return sets
\ No newline at end of file
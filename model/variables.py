@@ -1,11 +1,16 @@
 from gurobipy import *
 from utils.utils import unpack_sets, unpack_parameters
+from model.options import create_options
+from model.components import model_components
 
-def create_variables(model, sets, params):
+def create_variables(model, sets, params, options=None):
     """
     Create the variables for the model
     :return:
     """
+    if options is None:
+        options = create_options()
+
     # Unpack sets
     (bases, vessels, periods, charter_dict, charter_periods, tasks, vessel_task_compatibility,
      prev_tasks, corr_tasks, planned_prev_tasks, planned_corr_tasks, bundle_dict, bundles, spare_parts,
@@ -22,15 +27,8 @@ def create_variables(model, sets, params):
      tasks_in_bundles, technicians_required_bundle, weather_max_time_offshore,
      order_cost, lead_time, holding_cost, parts_required, max_part_capacity,
      reorder_level, big_m, max_capacity_for_docking,
-     additional_time, tech_standby_cost, initial_inventory) = unpack_parameters(params)
-
-    # Find the highest 'max_part_capacity' for all
-    capacities = []
-    for s in spare_parts:
-        for e in locations:
-            capacities.append(max_part_capacity[s, e])
-    max_capacity = max(capacities)
-
+     additional_time, tech_standby_cost, initial_inventory, feasible_bundles,
+     charter_period_of, corrective_failures, cumulative_corrective_failures, store) = unpack_parameters(params)
 
     #z_b
     base_use = model.addVars(bases, lb=0, ub=1, vtype=GRB.BINARY, name="base_use")
@@ -41,11 +39,12 @@ def create_variables(model, sets, params):
     #x_bvp
     chartered_vessels = model.addVars(bases, vessels, charter_periods, lb=0, vtype=GRB.INTEGER, name="chartered_vessels")
 
-    #y_evpm
-    task_performed = model.addVars(locations, ctvessels, periods, tasks, lb=0, vtype=GRB.INTEGER, name="task_performance")
+    #y_evpm (only for the ctvessels that are compatible with the task, period 0 see utils.initial_values)
+    task_keys = [(e, v, p, m) for e in locations for v in ctvessels for p in periods for m in sets['compatible_tasks'][v]]
+    task_performed = model.addVars(task_keys, lb=0, vtype=GRB.INTEGER, name="task_performance")
 
-    #n_evpk
-    bundle_performed = model.addVars(locations, ctvessels, periods, bundles, lb=0, vtype=GRB.INTEGER, name="bundle_performance")
+    #n_evpk (only for the bundles that fit in the time offshore)
+    bundle_performed = model.addVars([(e, v, p, k) for (e, v, p), feasible in feasible_bundles.items() for k in feasible], lb=0, vtype=GRB.INTEGER, name="bundle_performance")
 
     #e_m
     tasks_late = model.addVars(prev_tasks, lb=0, vtype=GRB.INTEGER, name="tasks_late")
@@ -56,49 +55,72 @@ def create_variables(model, sets, params):
     #l_pm
     periods_late = model.addVars(periods, corr_tasks, lb=0, vtype=GRB.INTEGER, name="periods_late")
 
-    #r_evpm
-    hours_spent = model.addVars(locations, ctvessels, periods, tasks, lb=0, vtype=GRB.CONTINUOUS, name='hours_spent')
+    #r_evpm (not in the aggregate formulation, see aggregate_hours_spent())
+    if options['time_spent_formulation'] != 'aggregate':
+        hours_spent = model.addVars(task_keys, lb=0, vtype=GRB.CONTINUOUS, name='hours_spent')
+    else:
+        hours_spent = None
+
+    #h_pm (hours of tasks carried over to the next period)
+    if options['time_spent_formulation'] == 'carry_over':
+        carry_over_hours = model.addVars(periods, tasks, lb=-GRB.INFINITY, vtype=GRB.CONTINUOUS, name='carry_over_hours')
+    else:
+        carry_over_hours = None
+
 
 
 
 
+    # Extension variables, only for the components in the model (see model.components)
+    components = model_components(sets, options)
+    inventory_level = order_quantity = order_trigger = None
+    mv_offshore = None
+    lambda_P = lambda_CH = mu_P = mu_CH = None
+    mv_purchased = mv_chartered = None
 
-    # Extension variables
-    # q_sep
-    inventory_level = model.addVars(spare_parts, locations, periods, lb=0, vtype=GRB.INTEGER, name="inventory_level")
+    if components['inventory']:
+        # Find the highest 'max_part_capacity' for all
+        capacities = []
+        for s in spare_parts:
+            for e in locations:
+                capacities.append(max_part_capacity[s, e])
+        max_capacity = max(capacities)
 
-    # o_sep
-    order_quantity = model.addVars(spare_parts, locations, periods, lb=0, vtype=GRB.INTEGER, name="order_quantity")
+        # q_sep
+        inventory_level = model.addVars(spare_parts, locations, periods, lb=0, vtype=GRB.INTEGER, name="inventory_level")
 
-    # o^trig_sep
-    order_trigger = model.addVars(spare_parts, locations, periods, lb=0, ub=1, vtype=GRB.BINARY, name="order_trigger")
+        # o_sep
+        order_quantity = model.addVars(spare_parts, locations, periods, lb=0, vtype=GRB.INTEGER, name="order_quantity")
 
-    # w_ep 
-    # docking_available = model.addVars(mother_vessels, periods, lb=0, ub=1, vtype=GRB.BINARY, name="docking_available")
+        # o^trig_sep
+        order_trigger = model.addVars(spare_parts, locations, periods, lb=0, ub=1, vtype=GRB.BINARY, name="order_trigger")
 
-    # d_ep
-    mv_offshore = model.addVars(mother_vessels, periods, lb=0, ub=1, vtype=GRB.BINARY, name="mothervessel_offshore")
-    for v in mother_vessels:
-        mv_offshore[v, 1].ub = 0
+    if components['mother_vessels']:
+        # w_ep 
+        # docking_available = model.addVars(mother_vessels, periods, lb=0, ub=1, vtype=GRB.BINARY, name="docking_available")
 
-    # lambda_sevp^P
-    lambda_P = model.addVars(spare_parts, bases, mother_vessels, periods, lb=0, ub=max_capacity, vtype=GRB.CONTINUOUS, name="lambda_P")
+        # d_ep
+        mv_offshore = model.addVars(mother_vessels, periods, lb=0, ub=1, vtype=GRB.BINARY, name="mothervessel_offshore")
+        for v in mother_vessels:
+            mv_offshore[v, 1].ub = 0
 
-    # lambda_sevp^CH
-    lambda_CH = model.addVars(spare_parts, bases, mother_vessels, periods, lb=0, ub=max_capacity, vtype=GRB.CONTINUOUS, name="lambda_CH")
+    if components['inventory']:
+        # lambda_sevp^P
+        lambda_P = model.addVars(spare_parts, bases, mother_vessels, periods, lb=0, ub=max_capacity, vtype=GRB.CONTINUOUS, name="lambda_P")
 
-    # mu_sevp^P
-    mu_P = model.addVars(spare_parts, bases, mother_vessels, periods, lb=0, ub=max_capacity, vtype=GRB.CONTINUOUS, name="mu_P")
+        # lambda_sevp^CH
+        lambda_CH = model.addVars(spare_parts, bases, mother_vessels, periods, lb=0, ub=max_capacity, vtype=GRB.CONTINUOUS, name="lambda_CH")
 
-    #mu_sevp^CH
-    mu_CH = model.addVars(spare_parts, bases, mother_vessels, periods, lb=0, ub=max_capacity, vtype=GRB.CONTINUOUS, name="mu_CH")
+        # mu_sevp^P
+        mu_P = model.addVars(spare_parts, bases, mother_vessels, periods, lb=0, ub=max_capacity, vtype=GRB.CONTINUOUS, name="mu_P")
 
-    # Initial values
-    for e in locations:
-        for v in vessels:
-            for m in tasks:
-                task_performed[e, v, 0, m] = 0
-                hours_spent[e, v, 0, m] = 0
+        #mu_sevp^CH
+        mu_CH = model.addVars(spare_parts, bases, mother_vessels, periods, lb=0, ub=max_capacity, vtype=GRB.CONTINUOUS, name="mu_CH")
+
+        # Binary copies of the purchased and chartered mothervessels (indicator_formulation 'product')
+        if options['indicator_formulation'] == 'product':
+            mv_purchased = model.addVars(bases, mother_vessels, vtype=GRB.BINARY, name="mothervessel_purchased")
+            mv_chartered = model.addVars(bases, mother_vessels, charter_periods, vtype=GRB.BINARY, name="mothervessel_chartered")
 
 
     vars = {
@@ -111,6 +133,7 @@ def create_variables(model, sets, params):
         'tasks_not_performed': tasks_not_performed,
         'periods_late': periods_late,
         'hours_spent': hours_spent,
+        'carry_over_hours': carry_over_hours,
         'inventory_level': inventory_level,
         'order_quantity': order_quantity,
         'order_trigger': order_trigger,
@@ -118,7 +141,22 @@ def create_variables(model, sets, params):
         'lambda_P': lambda_P,
         'lambda_CH': lambda_CH,
         'mu_P': mu_P,
-        'mu_CH': mu_CH
+        'mu_CH': mu_CH,
+        'mv_purchased': mv_purchased,
+        'mv_chartered': mv_chartered
     }
 
-    return vars
\ No newline at end of file
+    return vars
+
+
+def aggregate_hours_spent(task_performed, time_to_perform_task):
+    """
+    Hours spent on the tasks in the aggregate formulation (option 'time_spent_formulation'), in place of the
+    hours_spent variables. In the other formulations constraint 16 gives hours_spent = time_to_perform_task *
+    task_performed for every index: each row sets hours_spent - time * task_performed to minus the carry-over
+    of the previous period, so the carry-over stays 0 from period 0 on
+    :param task_performed: Variables task_performed
+    :param time_to_perform_task: Time to perform each task
+    :return: Dict with the linear expression of the hours spent per index of task_performed
+    """
+    return {(e, v, p, m): time_to_perform_task[m] * task_performed[e, v, p, m] for e, v, p, m in task_performed.keys()}
\ No newline at end of file
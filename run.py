@@ -6,9 +6,8 @@
 from utils.utils import load_input_data
 from model.sets import create_sets
 from model.parameters import create_parameters
-from model.variables import create_variables
-from model.constraints import add_constraints
-from model.objective import add_objective_function
+from model.options import create_options
+from model.build import build_model
 from model.GRASP import GRASP
 from utils.results import results
 from gurobipy import *
@@ -24,29 +23,25 @@ def main():
     # Load input data
     file_path = r'data/Inputs.xlsx'
     input_data = load_input_data(file_path)
-    # Define the year of the weather data
+    # Define the year (or start date, e.g. '2004-10-01') of the weather data
     year = 2004
+    # Define the seed of the corrective failures (None for a random seed)
+    seed = None
+    # Define the model options (formulations), see model/options.py
+    options = create_options()
 
     # Initiate time tracking
     start_time = time.time()
 
-    # Initialize the model
-    model = Model("de Gooijer, 2025")
-
-    # Create sets, parameters, and variables
-    sets = create_sets(input_data)
+    # Create sets and parameters
+    sets = create_sets(input_data, seed, options=options)
     params = create_parameters(input_data, sets, year)
-    vars = create_variables(model, sets, params)
-    model.update()
-
-    # Add constraints
-    add_constraints(model, sets, params, vars)
 
-    # Add objective function
-    add_objective_function(model, sets, params, vars)
+    # Initialize the model with its variables, constraints and objective function
+    model, vars = build_model(sets, params, options)
 
     # Optimize the model
-    GRASP(model, sets, params, vars, start_time)
+    GRASP(model, sets, params, vars, start_time, options)
     if model.status == GRB.OPTIMAL:
         model.write("results/solution_dG25_ME-GRASP.sol")
 
@@ -0,0 +1,183 @@
+"""
+Compare the build and solve performance of model formulations
+
+Usage: python -m utils.benchmark time_spent_formulation=carry_over,nested [--horizon 20] [--no-solve]
+Every combination of the given option values is built (and solved) on the same sets and parameters.
+Several horizons compare the variants on each instance, e.g. the formulations of the indicator constraints:
+python -m utils.benchmark indicator_formulation=indicator,big_m,product --horizon 10 15 20
+The root bound, and with --lp-bound the LP relaxation bound, show the strength of a formulation, e.g. of the big-M:
+python -m utils.benchmark big_m=global,tight --horizon 10 15 --lp-bound
+The formulations of constraint 16 give the same optimal cost, 'aggregate' without the hours_spent variables:
+python -m utils.benchmark time_spent_formulation=carry_over,nested,aggregate --horizon 10 20
+The extensions can be left out, e.g. to see what the spare parts inventory costs to build and solve:
+python -m utils.benchmark inventory_extension=True,False --horizon 20
+"""
+import argparse
+import itertools
+import time
+from gurobipy import *
+from utils.utils import load_input_data
+from model.sets import create_sets
+from model.parameters import create_parameters
+from model.options import create_options, DEFAULT_OPTIONS
+from model.build import build_model
+
+
+def benchmark(input_data, year, variants, seed=0, solve=True, time_limit=None, output=False, lp_bound=False):
+    """
+    Build and solve the model for each variant of the options
+    :param input_data: Scenario with the input data
+    :param year: Year or start date of the weather data
+    :param variants: Dict with a label and the option overrides of each variant
+    :param seed: Seed of the corrective failures, equal for all variants
+    :param solve: Solve the models, otherwise only build them
+    :param time_limit: Time limit per solve in seconds
+    :param output: Show the Gurobi log
+    :param lp_bound: Also solve the LP relaxation (without the general constraints) of each variant
+    :return: List with a dict of results per variant
+    """
+    # The sets (and so the parameters) depend on the option mothervessel_extension, created once per value
+    instances = {}
+
+    rows = []
+    for label, overrides in variants.items():
+        options = create_options(**overrides)
+        if options['mothervessel_extension'] not in instances:
+            sets = create_sets(input_data, seed, options=options)
+            instances[options['mothervessel_extension']] = (sets, create_parameters(input_data, sets, year))
+        sets, params = instances[options['mothervessel_extension']]
+        start_time = time.time()
+        model, vars = build_model(sets, params, options)
+        model.update()
+        row = {
+            'variant': label,
+            'build_time': time.time() - start_time,
+            'variables': model.NumVars,
+            'constraints': model.NumConstrs,
+            'gen_constraints': model.NumGenConstrs,
+            'nonzeros': model.NumNZs,
+        }
+        if lp_bound:
+            relaxed = model.relax()
+            relaxed.Params.OutputFlag = 0
+            relaxed.optimize()
+            row['lp_bound'] = relaxed.ObjVal if relaxed.Status == GRB.OPTIMAL else float('nan')
+            relaxed.dispose()
+        if solve:
+            model.Params.OutputFlag = int(output)
+            if time_limit is not None:
+                model.Params.TimeLimit = time_limit
+            model._root_bound = None
+            model.optimize(root_bound_callback)
+            row['status'] = model.Status
+            row['solve_time'] = model.Runtime
+            row['objective'] = model.ObjVal if model.SolCount > 0 else float('inf')
+            row['bound'] = model.ObjBound
+            row['root_bound'] = model._root_bound if model.NodeCount > 0 and model._root_bound is not None else model.ObjBound
+            if model.SolCount > 0:
+                row['root_gap'] = (row['objective'] - row['root_bound']) / max(abs(row['objective']), 1e-10)
+        model.dispose()
+        rows.append(row)
+
+    print_benchmark(rows)
+    if len(rows) > 1:
+        print_improvements(rows)
+    return rows
+
+
+def root_bound_callback(model, where):
+    """
+    Record the objective bound while the root node is solved, the bound after the root in model._root_bound
+    """
+    if where == GRB.Callback.MIP and model.cbGet(GRB.Callback.MIP_NODCNT) == 0:
+        model._root_bound = model.cbGet(GRB.Callback.MIP_OBJBND)
+
+
+def print_benchmark(rows):
+    """
+    Print the benchmark results as a table
+    """
+    columns = [c for c in ['variant', 'build_time', 'variables', 'constraints', 'gen_constraints', 'nonzeros',
+                           'lp_bound', 'status', 'solve_time', 'objective', 'bound', 'root_bound', 'root_gap']
+               if any(c in row for row in rows)]
+    print(' | '.join(f'{c:>15}' for c in columns))
+    for row in rows:
+        print(' | '.join(f'{row[c]:>15.3f}' if isinstance(row.get(c), float) else f'{str(row.get(c, "")):>15}'
+                         for c in columns))
+
+
+def print_improvements(rows):
+    """
+    Print the bounds (higher is stronger) and the solve time of each variant relative to the first variant
+    """
+    base = rows[0]
+    for row in rows[1:]:
+        changes = [f"{key} {100 * (row[key] - base[key]) / abs(base[key]):+.2f}%" for key in ['lp_bound', 'root_bound']
+                   if key in row and base[key] not in (0, float('inf'), float('-inf'))]
+        if 'solve_time' in row and row['solve_time'] > 0:
+            changes.append(f"solve time x{base['solve_time'] / row['solve_time']:.2f}")
+        print(f"{row['variant']} vs {base['variant']}: {', '.join(changes)}")
+
+
+def parse_variants(specs):
+    """
+    Parse option specifications such as 'time_spent_formulation=carry_over,nested' into variants
+    :return: Dict with a label and the option overrides of each combination of values
+    """
+    keys, values = [], []
+    for spec in specs:
+        key, _, value = spec.partition('=')
+        if key not in DEFAULT_OPTIONS:
+            raise ValueError(f"Unknown option '{key}', available options: {list(DEFAULT_OPTIONS)}")
+        keys.append(key)
+        values.append([parse_value(v) for v in value.split(',')])
+
+    variants = {}
+    for combination in itertools.product(*values):
+        label = ','.join(str(v) for v in combination) or 'default'
+        variants[label] = dict(zip(keys, combination))
+    return variants
+
+
+def parse_value(value):
+    """
+    Convert an option value given on the command line to a bool, number or string
+    """
+    if value in ('True', 'False', 'None'):
+        return {'True': True, 'False': False, 'None': None}[value]
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the build and solve performance of model formulations')
+    parser.add_argument('options', nargs='*', help="option values to compare, e.g. time_spent_formulation=carry_over,nested")
+    parser.add_argument('--input', default='data/Inputs.xlsx', help='input workbook')
+    parser.add_argument('--year', default='2004', help='year or start date of the weather data')
+    parser.add_argument('--horizon', type=int, nargs='+', help='planning horizon(s) in days, overrides the input workbook')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the corrective failures')
+    parser.add_argument('--time-limit', type=float, help='time limit per solve in seconds')
+    parser.add_argument('--no-solve', action='store_true', help='only build the models')
+    parser.add_argument('--lp-bound', action='store_true', help='also solve the LP relaxation of each model')
+    args = parser.parse_args()
+
+    input_data = load_input_data(args.input)
+    year = int(args.year) if args.year.isdigit() else args.year
+    variants = parse_variants(args.options)
+
+    for horizon in args.horizon or [None]:
+        instance = input_data
+        if horizon is not None:
+            instance = input_data.with_general(planning_horizon=horizon,
+                                               charter_period=min(horizon, input_data.general['charter_period']))
+        print(f"\nInstance: planning horizon of {instance.general['planning_horizon']} days")
+        benchmark(instance, year, variants, seed=args.seed, solve=not args.no_solve, time_limit=args.time_limit,
+                  lp_bound=args.lp_bound)
+
+
+if __name__ == '__main__':
+    main()
@@ -22,4 +22,22 @@ def get_periods_late(p, m, periods_late):
     if p == 0:
         return 0
     else:
-        return periods_late[p, m]
\ No newline at end of file
+        return periods_late[p, m]
+
+def get_carry_over_hours(p, m, carry_over_hours):
+    if p == 0:
+        return 0
+    else:
+        return carry_over_hours[p, m]
+
+def get_task_performed(e, v, p, m, task_performed):
+    if p == 0:
+        return 0
+    else:
+        return task_performed[e, v, p, m]
+
+def get_hours_spent(e, v, p, m, hours_spent):
+    if p == 0:
+        return 0
+    else:
+        return hours_spent[e, v, p, m]
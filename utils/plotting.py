@@ -1,7 +1,9 @@
 import matplotlib.pyplot as plt
 
 def plot_parts_vars(vars, params, sets):
-    # Plot spare parts decision variables
+    # Plot spare parts decision variables (none without the inventory extension, see model.components)
+    if vars['inventory_level'] is None:
+        return
     periods = sets['periods']
     periods_0 = [0] + list(periods)
     spare_parts = sets['spare_parts']
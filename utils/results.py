@@ -2,6 +2,7 @@ from gurobipy import *
 from utils.utils import *
 from utils.initial_values import *
 from utils.plotting import plot_parts_vars
+from model.constraint_table import restore_constraint_names
 import time
 import pickle
 
@@ -11,6 +12,8 @@ def results(model, sets, params, vars, start_time, end_time):
     (bases, vessels, periods, charter_dict, charter_periods, tasks, vessel_task_compatibility,
      prev_tasks, corr_tasks, planned_prev_tasks, planned_corr_tasks, bundle_dict, bundles, spare_parts,
      mother_vessels, ctvessels, locations) = unpack_sets(sets)
+    # Sparse support of task_performed and hours_spent, see model.sets
+    compatible_tasks = sets['compatible_tasks']
 
     # Unpack parameters
     (cost_base_operation, cost_vessel_purchase, cost_vessel_charter,
@@ -23,7 +26,8 @@ def results(model, sets, params, vars, start_time, end_time):
      tasks_in_bundles, technicians_required_bundle, weather_max_time_offshore,
      order_cost, lead_time, holding_cost, parts_required, max_part_capacity,
      reorder_level, big_m, max_capacity_for_docking,
-     additional_time, tech_standby_cost, initial_inventory) = unpack_parameters(params)
+     additional_time, tech_standby_cost, initial_inventory, feasible_bundles,
+     charter_period_of, corrective_failures, cumulative_corrective_failures, store) = unpack_parameters(params)
 
     # Unpack variables
     (base_use, purchased_vessels, chartered_vessels, task_performed,
@@ -33,6 +37,7 @@ def results(model, sets, params, vars, start_time, end_time):
 
 
     if model.status == GRB.Status.INFEASIBLE:
+        restore_constraint_names(model)
         model.computeIIS()
         model.write("results/infeasible.ilp")
         print("Model is infeasible. IIS written to 'infeasible.ilp'.")
@@ -42,13 +47,15 @@ def results(model, sets, params, vars, start_time, end_time):
         obj_cost_bases = sum(cost_base_operation[b] * base_use[b].x for b in bases)
         obj_cost_purchase_vessel = sum(cost_vessel_purchase[v] * purchased_vessels[b, v].x for v in vessels for b in bases)
         obj_cost_charter_vessel = sum(cost_vessel_charter[(v, p)] * chartered_vessels[b, v, p].x for v in vessels for b in bases for p in charter_periods)
-        obj_cost_operations = sum(hours_spent[e, v, p, m].x * (cost_vessel_operation[v] + cost_technicians * technicians_required_task[m]) for e in locations for v in ctvessels for p in periods for m in tasks)
-        obj_cost_downtime_preventive = sum(cost_downtime[p] * time_to_perform_task[m] * task_performed[e, v, p, m].x for e in locations for v in ctvessels for p in periods for m in prev_tasks)
-        obj_cost_downtime_corrective = sum(cost_downtime[p] * (task_performed[e, v, p, m].x * (distance_base_OWF[e] / vessel_speed[v] + 2 * transfer_time[v] + time_to_perform_task[m]) + periods_late[p, m].x * 24) for e in locations for v in ctvessels for p in periods for m in corr_tasks)
+        # Hours spent on the tasks, the task time of the tasks performed in the aggregate formulation
+        hours = {key: hours_spent[key].x if hours_spent is not None else time_to_perform_task[key[3]] * task_performed[key].x for key in task_performed.keys()}
+        obj_cost_operations = sum(hours[e, v, p, m] * (cost_vessel_operation[v] + cost_technicians * technicians_required_task[m]) for e in locations for v in ctvessels for p in periods for m in compatible_tasks[v])
+        obj_cost_downtime_preventive = sum(cost_downtime[p] * time_to_perform_task[m] * task_performed[e, v, p, m].x for e in locations for v in ctvessels for p in periods for m in prev_tasks if m in compatible_tasks[v])
+        obj_cost_downtime_corrective = sum(cost_downtime[p] * task_performed[e, v, p, m].x * (distance_base_OWF[e] / vessel_speed[v] + 2 * transfer_time[v] + time_to_perform_task[m]) for e in locations for v in ctvessels for p in periods for m in corr_tasks if m in compatible_tasks[v]) + sum(cost_downtime[p] * periods_late[p, m].x * 24 for e in locations for v in ctvessels for p in periods for m in corr_tasks)
         obj_cost_penalty_late = sum(penalty_preventive_late * tasks_late[m].x for m in prev_tasks)
         obj_cost_penalty_not_performed = sum(penalty_not_performed * tasks_not_performed[m].x for m in tasks)
-        obj_cost_spare_parts = sum(holding_cost[s, e] * inventory_level[s, e, p].x for s in spare_parts for e in locations for p in periods) + sum(order_cost[s] * order_quantity[s, e, p].x for s in spare_parts for e in bases for p in periods)
-        obj_cost_mothervessels = sum(cost_vessel_operation[v] * mv_offshore[v, p].x for v in mother_vessels for p in periods)
+        obj_cost_spare_parts = 0 if inventory_level is None else sum(holding_cost[s, e] * inventory_level[s, e, p].x for s in spare_parts for e in locations for p in periods) + sum(order_cost[s] * order_quantity[s, e, p].x for s in spare_parts for e in bases for p in periods)
+        obj_cost_mothervessels = 0 if mv_offshore is None else sum(cost_vessel_operation[v] * mv_offshore[v, p].x for v in mother_vessels for p in periods)
         total_cost = obj_cost_bases + obj_cost_purchase_vessel + obj_cost_charter_vessel + obj_cost_operations + obj_cost_downtime_preventive + obj_cost_downtime_corrective + obj_cost_penalty_late + obj_cost_penalty_not_performed + obj_cost_spare_parts + obj_cost_mothervessels
 
         # Print the vessels purchased and chartered at each base
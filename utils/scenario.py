@@ -0,0 +1,221 @@
+import os
+import pickle
+from dataclasses import dataclass
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
+from utils.weather import CACHE_DIR, file_hash
+
+BUNDLE_VERSION = 1          # Increase when the layout of the scenario bundle changes
+
+# Sheets with one row per set element (identified by 'SET') and the columns they must have
+TABLE_COLUMNS = {
+    'bases': ['SET', 'distance', 'technicians_available', 'cost'],
+    'vessels': ['SET', 'MV', 'Hslimit', 'speed', 'cost_charter_day', 'tech_cap', 'transfer_time', 'available',
+                'max_time_offshore', 'cost_purchase', 'cost_operation', 'additional_time'],
+    'mother_vessels': ['SET'],
+    'locations': ['SET', 'distance', 'max_capacity_for_docking', 'technicians_available', 'initial_inventory'],
+    'tasks': ['SET', 'PRE/COR', 'active_time', 'technicians', 'failure_rate', 'repair_cost', 'preventive_rate'],
+    'spare_parts': ['SET', 'order_cost', 'lead_time'],
+}
+
+# Sheets with a matrix of values, with the tables their row and column labels come from
+MATRIX_AXES = {
+    'task_compatibility': ('tasks', 'vessels'),
+    'capacity_base_vessels': ('bases', 'vessels'),
+    'holding_costs': ('spare_parts', 'locations'),
+    'spare_parts_required': ('spare_parts', 'tasks'),
+    'max_capacity': ('spare_parts', 'locations'),
+    'reorder_level': ('spare_parts', 'locations'),
+}
+
+GENERAL_COLUMNS = ['turbines', 'planning_horizon', 'charter_period', 'cost_technicians', 'cost_downtime',
+                   'penalty_cost_late', 'penalty_cost_not_performed', 'latest_period', 'tech_standby_cost']
+
+
+def read_only(values):
+    """
+    Return the array with writing disabled, so a shared bundle cannot be modified by accident
+    """
+    values = np.array(values)
+    values.flags.writeable = False
+    return values
+
+
+def compile_scenario(file_path, source_hash=None):
+    """
+    Read and validate the input workbook and convert it into a scenario bundle
+    :param file_path: Path to the input workbook
+    :param source_hash: Hash of the workbook, computed when not given
+    :return: Dict with the general parameters, the tables and the matrices as NumPy arrays
+    """
+    sheets = pd.read_excel(file_path, sheet_name=None)
+    missing = [s for s in ['general', *TABLE_COLUMNS, *MATRIX_AXES] if s not in sheets]
+    if missing:
+        raise ValueError(f"Input file {file_path} is missing the sheets {missing}")
+
+    # General parameters
+    general = sheets['general']
+    missing = [c for c in GENERAL_COLUMNS if c not in general.columns]
+    if missing or len(general) != 1:
+        raise ValueError(f"Sheet 'general' must have one row with the columns {GENERAL_COLUMNS}, missing {missing}")
+
+    # Tables
+    tables = {}
+    for sheet, columns in TABLE_COLUMNS.items():
+        df = sheets[sheet]
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"Sheet '{sheet}' is missing the columns {missing}")
+        if df['SET'].isna().any() or df['SET'].duplicated().any():
+            raise ValueError(f"Sheet '{sheet}' has empty or duplicate entries in 'SET'")
+        if df[columns].iloc[:, 1:].isna().any().any():
+            raise ValueError(f"Sheet '{sheet}' has empty values")
+        tables[sheet] = {
+            'ids': tuple(df['SET'].tolist()),
+            'columns': {c: read_only(df[c].to_numpy()) for c in df.columns},
+        }
+
+    # Matrices, each row and column label must be an element of the corresponding table
+    matrices = {}
+    for sheet, (row_table, col_table) in MATRIX_AXES.items():
+        df = sheets[sheet]
+        index_name = df.columns[0]
+        df = df.set_index(index_name)
+        row_ids, col_ids = tables[row_table]['ids'], tables[col_table]['ids']
+        missing_rows = [i for i in row_ids if i not in df.index]
+        missing_cols = [i for i in col_ids if i not in df.columns]
+        if missing_rows or missing_cols:
+            raise ValueError(f"Sheet '{sheet}' is missing the rows {missing_rows} and columns {missing_cols}")
+        values = df.loc[list(row_ids), list(col_ids)]
+        if values.isna().any().any() or not all(pd.api.types.is_numeric_dtype(t) for t in values.dtypes):
+            raise ValueError(f"Sheet '{sheet}' must contain a number for every {row_table} and {col_table} pair")
+        matrices[sheet] = {
+            'index_name': index_name,
+            'rows': row_ids,
+            'cols': col_ids,
+            'values': read_only(values.to_numpy()),
+        }
+
+    return {
+        'version': BUNDLE_VERSION,
+        'hash': source_hash if source_hash is not None else file_hash(file_path),
+        'general': {c: general[c].iloc[0].item() for c in general.columns},
+        'tables': tables,
+        'matrices': matrices,
+    }
+
+
+def load_scenario_bundle(file_path, cache_dir=CACHE_DIR):
+    """
+    Load the compiled scenario bundle of the input workbook, compiling it when the workbook has changed
+    :param file_path: Path to the input workbook
+    :param cache_dir: Directory holding the compiled bundles
+    :return: Scenario bundle
+    """
+    source_hash = file_hash(file_path)
+    bundle_path = os.path.join(cache_dir, f'scenario_v{BUNDLE_VERSION}_{source_hash[:16]}.pkl')
+    if os.path.exists(bundle_path):
+        with open(bundle_path, 'rb') as f:
+            bundle = pickle.load(f)
+        for table in bundle['tables'].values():
+            for values in table['columns'].values():
+                values.flags.writeable = False
+        for matrix in bundle['matrices'].values():
+            matrix['values'].flags.writeable = False
+        return bundle
+
+    bundle = compile_scenario(file_path, source_hash)
+
+    # Write to a temporary file first, so concurrent runs never read a half-written bundle
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{bundle_path}.tmp{os.getpid()}'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, bundle_path)
+    return bundle
+
+
+def freeze(value):
+    """
+    Recursively wrap the dicts of a scenario bundle in read-only mapping proxies
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    return value
+
+
+def thaw(value):
+    """
+    Recursively convert the read-only mapping proxies of a scenario back into dicts
+    """
+    if isinstance(value, MappingProxyType):
+        return {k: thaw(v) for k, v in value.items()}
+    return value
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Immutable input data of a scenario
+    A scenario is built once and can be shared read-only by any number of model builds, also across
+    threads and worker processes. Every call to table() or matrix() returns a new DataFrame, so the
+    model builders never modify the shared data.
+    """
+    hash: str
+    general: MappingProxyType
+    tables: MappingProxyType
+    matrices: MappingProxyType
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        return cls(hash=bundle['hash'], general=freeze(bundle['general']),
+                   tables=freeze(bundle['tables']), matrices=freeze(bundle['matrices']))
+
+    def to_bundle(self):
+        return {'version': BUNDLE_VERSION, 'hash': self.hash, 'general': thaw(self.general),
+                'tables': thaw(self.tables), 'matrices': thaw(self.matrices)}
+
+    def __reduce__(self):
+        # Mapping proxies cannot be pickled, a scenario is sent to worker processes as its bundle
+        return Scenario.from_bundle, (self.to_bundle(),)
+
+    def with_general(self, **changes):
+        """
+        Return a copy of the scenario with some general parameters changed, e.g. the planning horizon
+        """
+        unknown = [c for c in changes if c not in self.general]
+        if unknown:
+            raise ValueError(f"Unknown general parameters {unknown}")
+        bundle = self.to_bundle()
+        bundle['general'].update(changes)
+        return Scenario.from_bundle(bundle)
+
+    def ids(self, name):
+        """
+        Return the 'SET' ids of a table
+        """
+        return list(self.tables[name]['ids'])
+
+    def table(self, name):
+        """
+        Return a new DataFrame of a table, indexed by 'SET'
+        """
+        return pd.DataFrame(dict(self.tables[name]['columns'])).set_index('SET')
+
+    def matrix(self, name):
+        """
+        Return a new DataFrame of a matrix, indexed by the ids of its rows and columns
+        """
+        matrix = self.matrices[name]
+        return pd.DataFrame(matrix['values'], index=list(matrix['rows']), columns=list(matrix['cols']))
+
+
+def load_scenario(file_path, cache_dir=CACHE_DIR):
+    """
+    Load the input workbook as an immutable scenario
+    :param file_path: Path to the input workbook
+    :param cache_dir: Directory holding the compiled bundles
+    :return: Scenario
+    """
+    return Scenario.from_bundle(load_scenario_bundle(file_path, cache_dir))
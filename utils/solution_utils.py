@@ -1,4 +1,5 @@
 from gurobipy import *
+from model.constraint_table import restore_constraint_names
 
 def solve_return_obj(model):
     """
@@ -8,6 +9,7 @@ def solve_return_obj(model):
     model.optimize()
     if model.Status in (GRB.INFEASIBLE, GRB.INF_OR_UNBD):
         print("Model is infeasible -- computing IIS …")
+        restore_constraint_names(model)
         model.computeIIS()  # asks Gurobi for a minimal conflicting set
         model.write("infeasible.ilp")  # or .lp / .json / .mps
         print("Wrote infeasible.ilp  (open it in a text editor or IDE)")
@@ -20,10 +22,19 @@ def solve_return_obj(model):
 def flatten_decision_vars(vars_dict):
     """
     Return an ordered list with every perchased vessel, chartered vessel and base used variable.
+    This is the order of the fleet vector (solution) of model.GRASP.
     """
     ordered = []
-    ordered.extend(vars_dict["purchased_vessel"].values())
-    ordered.extend(vars_dict["chartered_vessel"].values())
-    ordered.extend(vars_dict["base_used"].values())
+    ordered.extend(vars_dict["purchased_vessels"].values())
+    ordered.extend(vars_dict["chartered_vessels"].values())
+    ordered.extend(vars_dict["base_use"].values())
 
     return ordered
+
+def fix_fleet(model, vars_dict, fleet):
+    """
+    Fix the purchased vessels, chartered vessels and base use to a fleet vector (order of flatten_decision_vars)
+    """
+    ordered = flatten_decision_vars(vars_dict)
+    model.setAttr(GRB.Attr.LB, ordered, list(fleet))
+    model.setAttr(GRB.Attr.UB, ordered, list(fleet))
@@ -1,44 +1,130 @@
 import pandas as pd
 import numpy as np
 import itertools
+from utils.scenario import load_scenario
+from utils.weather import (get_weather_year, get_weather_window, workable_hours, load_power_curve,
+                           downtime_cost)
 
 def load_input_data(file_path):
     """
     Load input data from a file
+    The workbook is validated and compiled into a scenario bundle once, later runs start from the bundle.
 
     :param file_path: Path to the input data file
-    :return: DataFrame with input data
+    :return: Immutable Scenario with the input data
     """
 
-    data = pd.read_excel(file_path, sheet_name=None)
-    data['task_compatibility'] = pd.read_excel(file_path, sheet_name='task_compatibility', index_col=0)
-    # data['tasks'] = pd.read_excel(file_path, sheet_name='tasks', index_col=0)
+    data = load_scenario(file_path)
     return data
 
 
-def generate_corrective_maintenance_tasks(corr_tasks, periods, turbines, input_tasks):
+def generate_corrective_failures(corr_tasks, periods, turbines, input_tasks, n_scenarios=1, seed=None):
+    """
+    Draw the number of failures per corrective task and period for a batch of scenarios
+    Every turbine fails independently with probability failure_rate / len(periods) in each period,
+    so the failures per task and period are binomially distributed.
+
+    :param corr_tasks: Corrective tasks
+    :param periods: Periods
+    :param turbines: Number of turbines
+    :param input_tasks: DataFrame with the tasks, indexed by 'SET'
+    :param n_scenarios: Number of failure scenarios
+    :param seed: Seed or numpy.random.Generator, None for a random seed
+    :return: Integer array of shape (scenarios, tasks, periods) with the failures
+    """
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    failure_probability = input_tasks.loc[corr_tasks, 'failure_rate'].to_numpy(dtype=np.float64) / len(periods)
+    failure_probability = np.clip(failure_probability, 0, 1)[np.newaxis, :, np.newaxis]
+
+    return rng.binomial(turbines, failure_probability, size=(n_scenarios, len(corr_tasks), len(periods))).astype(np.int32)
+
+
+def corrective_tasks_view(failures, corr_tasks, periods):
+    """
+    View the failures of one scenario as a DataFrame with the corrective tasks as index and periods as columns
+    :param failures: Integer array of shape (tasks, periods)
+    :return: DataFrame sharing its data with the array
+    """
+    return pd.DataFrame(failures, index=corr_tasks, columns=periods, copy=False)
+
 
-    daily_failures = pd.DataFrame(index=corr_tasks, columns=periods)
-    failures = {}
-    for m in corr_tasks:
-        for p in periods:
-            failures[p] = np.random.uniform(size=turbines)  # uniform distribution of the failures
-            daily_failures.loc[m, p] = sum(x < input_tasks.loc[m, 'failure_rate'] / len(periods) for x in failures[p])
+def generate_corrective_maintenance_tasks(corr_tasks, periods, turbines, input_tasks, seed=None):
+    failures = generate_corrective_failures(corr_tasks, periods, turbines, input_tasks, seed=seed)
+    return corrective_tasks_view(failures[0], corr_tasks, periods)
 
-    return daily_failures
 
+def generate_task_bundles(tasks, technicians_required=None, max_technicians=None, max_time_offshore=None,
+                          transfer_time=None, max_bundle_size=4):
+    """
+    Generate the task bundles as multisets of tasks, so every combination of tasks appears once
+    Bundles that need more technicians than any vessel can provide (constraint 7) are left out, as are bundles
+    whose time capacity len(k) * (max_time_offshore - transfer_time * (1 + len(k))) of constraints 3 and 4 is
+    negative for every vessel (see generate_feasible_bundles(), which leaves them out at every location).
+
+    :param tasks: Tasks
+    :param technicians_required: Technicians required per task
+    :param max_technicians: Largest technician capacity of the vessels performing bundles
+    :param max_time_offshore: Maximum time offshore of each vessel performing bundles
+    :param transfer_time: Transfer time of each vessel performing bundles, in the order of max_time_offshore
+    :param max_bundle_size: Largest number of tasks in a bundle
+    :return: Dict with the bundle ids as keys and the tuples of tasks as values
+    """
+    if max_time_offshore is not None:
+        offshore = np.asarray(max_time_offshore, dtype=np.float64)
+        transfer = np.asarray(transfer_time, dtype=np.float64)
 
-def generate_task_bundles(tasks):
     bundle_dict = {}
     bundle_id = 1
-    for i in range(1, 5):  # bundle sizes 1 to 4
-        for combo in itertools.product(tasks, repeat=i):
+    for i in range(1, max_bundle_size + 1):
+        # Same time capacity and tolerance as generate_feasible_bundles(), it only depends on the bundle size
+        if max_time_offshore is not None and not np.any(i * (offshore - transfer * (1 + i)) >= -1e-9):
+            continue
+        for combo in itertools.combinations_with_replacement(tasks, i):
+            if max_technicians is not None and sum(technicians_required[m] for m in combo) > max_technicians:
+                continue
             bundle_name = f'K{bundle_id}'
             bundle_dict[bundle_name] = combo
             bundle_id += 1
     return bundle_dict
 
 
+def generate_feasible_bundles(locations, bases, mother_vessels, ctvessels, periods, bundle_dict, max_time_offshore,
+                              transfer_time, distance_base_OWF, vessel_speed, weather_max_time_offshore):
+    """
+    Generates the bundles each CTV can perform per location and period
+    A bundle is left out when its time capacity in constraint 3 (bases), 4 (mothervessels) or
+    5 (weather window) is negative, as the bundle then does not fit in the time offshore.
+
+    :return: Dict with the list of feasible bundles for each (location, ctvessel, period)
+    """
+    bundles = list(bundle_dict)
+    size = np.array([len(bundle_dict[k]) for k in bundles], dtype=np.float64)                                 # (K,)
+    offshore = np.array([max_time_offshore[v] for v in ctvessels], dtype=np.float64)[:, np.newaxis]            # (V, 1)
+    transfer = np.array([transfer_time[v] for v in ctvessels], dtype=np.float64)[:, np.newaxis]                # (V, 1)
+    travel = (2 * np.array([distance_base_OWF[e] for e in locations], dtype=np.float64)[:, np.newaxis]
+              / np.array([vessel_speed[v] for v in ctvessels], dtype=np.float64)[np.newaxis, :])               # (E, V)
+    weather = np.array([[weather_max_time_offshore[v, p] for p in periods] for v in ctvessels],
+                       dtype=np.float64).reshape(len(ctvessels), len(periods))                                 # (V, P)
+
+    # Time capacity of each bundle within the maximum time offshore and within the weather window
+    offshore_capacity = size * (offshore - transfer * (1 + size))                                       # (V, K)
+    weather_capacity = size * (weather[:, :, np.newaxis] - transfer[:, :, np.newaxis] * (1 + size))    # (V, P, K)
+
+    tolerance = 1e-9
+    is_base = np.isin(locations, bases)[:, np.newaxis, np.newaxis, np.newaxis]
+    is_mother_vessel = np.isin(locations, mother_vessels)[:, np.newaxis, np.newaxis, np.newaxis]
+    feasible = weather_capacity[np.newaxis] - travel[:, :, np.newaxis, np.newaxis] >= -tolerance       # (E, V, P, K)
+    feasible &= ~is_base | (offshore_capacity[np.newaxis, :, np.newaxis, :] - travel[:, :, np.newaxis, np.newaxis] >= -tolerance)
+    feasible &= ~is_mother_vessel | (offshore_capacity[np.newaxis, :, np.newaxis, :] >= -tolerance)
+
+    feasible = feasible.tolist()
+    feasible_bundles = {
+        (e, v, p): list(itertools.compress(bundles, feasible[i][j][l]))
+        for i, e in enumerate(locations) for j, v in enumerate(ctvessels) for l, p in enumerate(periods)
+    }
+
+    return feasible_bundles
+
 def unpack_sets(sets):
     """
     Unpack the sets dictionary into individual variables
@@ -107,6 +193,11 @@ def unpack_parameters(params):
     additional_time = params['additional_time']  
     tech_standby_cost = params['tech_standby_cost']
     initial_inventory = params['initial_inventory']
+    feasible_bundles = params['feasible_bundles']
+    charter_period_of = params['charter_period_of']
+    corrective_failures = params['corrective_failures']
+    cumulative_corrective_failures = params['cumulative_corrective_failures']
+    store = params['store']
 
 
     return (cost_base_operation, cost_vessel_purchase, cost_vessel_charter,
@@ -119,7 +210,8 @@ def unpack_parameters(params):
             tasks_in_bundles, technicians_required_bundle, weather_max_time_offshore,
             order_cost, lead_time, holding_cost, parts_required, max_part_capacity,
             reorder_level, big_m, max_capacity_for_docking,
-            additional_time, tech_standby_cost, initial_inventory)
+            additional_time, tech_standby_cost, initial_inventory, feasible_bundles,
+            charter_period_of, corrective_failures, cumulative_corrective_failures, store)
 
 def unpack_variables(vars):
     """
@@ -166,62 +258,73 @@ def generate_weather_set(year):
     Generates the weather set for the project.
 
     :param year
-    :return: K
-    """
-    file_path = 'data/weatherconditions.xlsx'
-
-    if year == 2004:
-        weather = pd.read_excel(file_path, nrows=8783, usecols=['Year', 'Month', 'Day', 'Hour', 'Wind Speed', 'Wave Height'])
-    elif year == 2005:
-        weather = pd.read_excel(file_path, nrows=8760, skiprows=range(1, 8784),
-                                usecols=['Year', 'Month', 'Day', 'Hour', 'Wind Speed', 'Wave Height'])
-    elif year == 2006:
-        weather = pd.read_excel(file_path, nrows=8760, skiprows=range(1, 17544),
-                                usecols=['Year', 'Month', 'Day', 'Hour', 'Wind Speed', 'Wave Height'])
-    elif year == 2007:
-        weather = pd.read_excel(file_path, nrows=8760, skiprows=range(1, 26304),
-                                usecols=['Year', 'Month', 'Day', 'Hour', 'Wind Speed', 'Wave Height'])
-    elif year == 2008:
-        weather = pd.read_excel(file_path, nrows=8784, skiprows=range(1, 35064),
-                                usecols=['Year', 'Month', 'Day', 'Hour', 'Wind Speed', 'Wave Height'])
-    elif year == 2009:
-        weather = pd.read_excel(file_path, nrows=8760, skiprows=range(1, 43848),
-                                usecols=['Year', 'Month', 'Day', 'Hour', 'Wind Speed', 'Wave Height'])
-    elif year == 2010:
-        weather = pd.read_excel(file_path, nrows=8760, skiprows=range(1, 52608),
-                                usecols=['Year', 'Month', 'Day', 'Hour', 'Wind Speed', 'Wave Height'])
-    elif year == 2011:
-        weather = pd.read_excel(file_path, nrows=8784, skiprows=range(1, 61368),
-                                usecols=['Year', 'Month', 'Day', 'Hour', 'Wind Speed', 'Wave Height'])
-
-    return weather
+    :return: DataFrame with the hourly weather of the year
+    """
+    weather = get_weather_year(year)
+    time = pd.DatetimeIndex(weather['time'])
+    return pd.DataFrame({
+        'Year': time.year,
+        'Month': time.month,
+        'Day': time.day,
+        'Hour': time.hour,
+        'Wind Speed': weather['wind_speed'],
+        'Wave Height': weather['wave_height'],
+    })
+
+def generate_availability_matrix(vessels, periods, year, data):
+    """
+    Generates the workable hours per vessel and period from the wave height limits
+
+    :param vessels: Vessels
+    :param periods: Periods
+    :param year: Year or start date ('YYYY-MM-DD') of the weather data
+    :param data: Scenario with the input data
+    :return: Array of shape (vessels, periods) with the workable hours
+    """
+    wave_height = get_weather_window(year, max(periods))['wave_height']
+    hs_limits = data.table('vessels').loc[vessels, 'Hslimit'].to_numpy()
+    return workable_hours(wave_height[[p - 1 for p in periods]], hs_limits)
 
 def generate_availability_set(vessels, periods, year, data):
-    df_weather = generate_weather_set(year)
+    """
+    Generates the workable hours per vessel and period from the wave height limits
 
-    weather_max_time_offshore = {}
+    :param vessels: Vessels
+    :param periods: Periods
+    :param year: Year or start date ('YYYY-MM-DD') of the weather data
+    :param data: Scenario with the input data
+    :return: Dict with the workable hours for each (vessel, period)
+    """
+    hours_available = generate_availability_matrix(vessels, periods, year, data).tolist()
 
-    for v in vessels:
-        for p in periods:
-            if p == 1:
-                hours_available = sum(df_weather.loc[i, 'Wave Height'] < data['vessels'].loc[v, 'Hslimit'] for i in range(0, 23))
-            else:
-                hours_available = sum(df_weather.loc[i, 'Wave Height'] < data['vessels'].loc[v, 'Hslimit'] for i in range((24*p-25), (24*p-1)))
-            weather_max_time_offshore[v, p] = hours_available
+    weather_max_time_offshore = {
+        (v, p): hours_available[i][j]
+        for i, v in enumerate(vessels) for j, p in enumerate(periods)
+    }
 
     return weather_max_time_offshore
 
 def generate_downtime_cost(periods, year):
-    df_windpower = pd.read_excel('data/windpower.xlsx', usecols=['Wind speed', 'Power'])
-    df_weather = generate_weather_set((year))
-
-    cost_downtime = {}
-    for p in periods:
-        if p == 1:
-            cost_downtime[p] = (90/1000) * df_windpower.loc[np.where(df_windpower['Wind speed'] == round(
-                sum(df_weather.loc[i, 'Wind Speed'] for i in range(0, 23))/23)), 'Power'].values[0]
-        else:
-            cost_downtime[p] = (90 / 1000) * df_windpower.loc[np.where(df_windpower['Wind speed'] == round(
-                sum(df_weather.loc[i, 'Wind Speed'] for i in range((24*p-25), (24*p-1))) / 24)), 'Power'].values[0]
-
-    return cost_downtime
\ No newline at end of file
+    """
+    Generates the hourly downtime cost per period from the daily mean wind speed
+
+    :param periods: Periods
+    :param year: Year or start date ('YYYY-MM-DD') of the weather data
+    :return: Dict with the downtime cost for each period
+    """
+    cost = generate_downtime_cost_batch(periods, [year])[0].tolist()
+    cost_downtime = {p: cost[j] for j, p in enumerate(periods)}
+
+    return cost_downtime
+
+def generate_downtime_cost_batch(periods, years):
+    """
+    Generates the downtime cost per period for several weather years at once
+
+    :param periods: Periods
+    :param years: Years or start dates ('YYYY-MM-DD') of the weather data
+    :return: Array of shape (years, periods) with the downtime cost
+    """
+    wind_speed = [get_weather_window(year, max(periods))['wind_speed'][[p - 1 for p in periods]] for year in years]
+
+    return downtime_cost(np.stack(wind_speed), load_power_curve())
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+WEATHER_FILE = 'data/weatherconditions.xlsx'
+POWER_CURVE_FILE = 'data/windpower.xlsx'
+CACHE_DIR = 'data/cache'
+STORE_VERSION = 2           # Increase when the layout of the weather store changes
+ELECTRICITY_PRICE = 90      # €/MWh, used to value the lost production during downtime
+
+# Columns of the weather workbook and the name of the .npy file they are stored in
+WEATHER_COLUMNS = {
+    'Year': 'year',
+    'Month': 'month',
+    'Day': 'day',
+    'Hour': 'hour',
+    'Wind Speed': 'wind_speed',
+    'Wave Height': 'wave_height',
+}
+WEATHER_VALUES = ['wind_speed', 'wave_height']
+
+# Weather stores and power curves that are already opened in this process, keyed by source path, modification
+# time and size
+_stores = {}
+_power_curves = {}
+
+
+def file_hash(file_path):
+    """
+    Compute the SHA-256 hash of a file
+    :param file_path: Path to the file
+    :return: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_weather_store(file_path, store_dir, source_hash):
+    """
+    Convert the weather workbook into an hourly grid with one .npy file per weather value
+    The grid runs from 00:00 of the first recorded day to 23:00 of the last complete day. Hours
+    missing from the data are filled with the nearest recorded hour.
+    :param file_path: Path to the weather workbook
+    :param store_dir: Directory to write the store to
+    :param source_hash: Hash of the workbook, stored to validate the cache
+    """
+    df_weather = pd.read_excel(file_path, usecols=list(WEATHER_COLUMNS))
+    columns = {name: df_weather[column].to_numpy() for column, name in WEATHER_COLUMNS.items()}
+
+    # Timestamp of every record
+    months = (columns['year'].astype(np.int64) - 1970) * 12 + columns['month'] - 1
+    dates = months.astype('datetime64[M]').astype('datetime64[D]') + (columns['day'] - 1)
+    timestamps = dates.astype('datetime64[h]') + columns['hour']
+    order = np.argsort(timestamps, kind='stable')
+    timestamps = timestamps[order]
+
+    # Hour of every record on the grid, a partially recorded last day is dropped
+    start = timestamps[0].astype('datetime64[D]').astype('datetime64[h]')
+    hour = (timestamps - start).astype(np.int64)
+    n_hours = (int(hour[-1]) + 1) // 24 * 24
+    recorded = hour < n_hours
+    hour, order = hour[recorded], order[recorded]
+
+    # Index of the nearest recorded hour for every hour of the grid
+    positions = np.arange(n_hours)
+    is_recorded = np.zeros(n_hours, dtype=bool)
+    is_recorded[hour] = True
+    previous = np.maximum.accumulate(np.where(is_recorded, positions, -1))
+    following = np.minimum.accumulate(np.where(is_recorded, positions, n_hours)[::-1])[::-1]
+    previous_gap = np.where(previous >= 0, positions - previous, n_hours)
+    following_gap = np.where(following < n_hours, following - positions, n_hours)
+    nearest = np.where(previous_gap <= following_gap, previous, following)
+
+    # Write to a temporary directory first, so concurrent runs never see a half-written store
+    tmp_dir = f'{store_dir}.tmp{os.getpid()}'
+    os.makedirs(tmp_dir, exist_ok=True)
+    for name in WEATHER_VALUES:
+        grid = np.empty(n_hours)
+        grid[hour] = columns[name][order]
+        np.save(os.path.join(tmp_dir, f'{name}.npy'), grid[nearest])
+
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump({'source': os.path.basename(file_path), 'hash': source_hash, 'version': STORE_VERSION,
+                   'start': str(start), 'hours': n_hours, 'filled_hours': int(n_hours - len(hour))}, f)
+
+    try:
+        os.replace(tmp_dir, store_dir)
+    except OSError:
+        # Another process finished the same store first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def load_weather_store(file_path=WEATHER_FILE, cache_dir=CACHE_DIR):
+    """
+    Load the columnar weather store, (re)building it when the workbook has changed
+    The workbook is only hashed when it is not opened in this process yet or its modification time or size
+    changed, to find (or build) the store on disk.
+    :param file_path: Path to the weather workbook
+    :param cache_dir: Directory holding the weather stores
+    :return: Dict with the source hash, the first hour and the memory-mapped hourly values
+    """
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    store = _stores.get(key)
+    if store is not None:
+        return store
+
+    source_hash = file_hash(file_path)
+
+    store_dir = os.path.join(cache_dir, f'weather_v{STORE_VERSION}_{source_hash[:16]}')
+    meta_path = os.path.join(store_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        build_weather_store(file_path, store_dir, source_hash)
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    store = {
+        'hash': meta['hash'],
+        'start': np.datetime64(meta['start'], 'h'),
+        'days': meta['hours'] // 24,
+        'columns': {name: np.load(os.path.join(store_dir, f'{name}.npy'), mmap_mode='r')
+                    for name in WEATHER_VALUES},
+    }
+    _stores[key] = store
+    return store
+
+
+def get_weather_window(start, n_days=None, file_path=WEATHER_FILE):
+    """
+    Return the weather of a contiguous window of days as zero-copy slices of the store
+    :param start: First day of the window, either a year (1 January) or a date such as '2004-10-01'
+    :param n_days: Number of days in the window, by default until the end of the starting year
+    :param file_path: Path to the weather workbook
+    :return: Dict with a read-only (days, 24) array for the wind speed and wave height
+    """
+    store = load_weather_store(file_path)
+    first_day = np.datetime64(f'{start}-01-01' if isinstance(start, (int, np.integer)) else start, 'D')
+    if n_days is None:
+        n_days = int((first_day.astype('datetime64[Y]') + 1 - first_day).astype(np.int64))
+
+    offset = int((first_day - store['start'].astype('datetime64[D]')).astype(np.int64))
+    if offset < 0 or offset + n_days > store['days']:
+        last_day = store['start'].astype('datetime64[D]') + store['days'] - 1
+        raise ValueError(f"No weather data for {n_days} days from {first_day}, "
+                         f"available from {store['start'].astype('datetime64[D]')} to {last_day}")
+
+    return {name: column[24 * offset:24 * (offset + n_days)].reshape(n_days, 24)
+            for name, column in store['columns'].items()}
+
+
+def get_weather_year(year, file_path=WEATHER_FILE):
+    """
+    Return the hourly weather of a single year as zero-copy slices of the store
+    :param year: Year of the weather data
+    :param file_path: Path to the weather workbook
+    :return: Dict with the timestamps and a read-only array per weather value
+    """
+    window = get_weather_window(year, file_path=file_path)
+    weather = {name: values.reshape(-1) for name, values in window.items()}
+    weather['time'] = np.datetime64(f'{year}-01-01T00', 'h') + np.arange(len(weather['wind_speed']))
+    return weather
+
+
+def workable_hours(wave_height, hs_limits):
+    """
+    Number of hours per day in which the wave height is below the limit of each vessel
+    :param wave_height: Array of shape (days, 24) with the hourly wave height
+    :param hs_limits: Array of shape (vessels,) with the significant wave height limits
+    :return: Array of shape (vessels, days) with the workable hours
+    """
+    wave_height = np.asarray(wave_height)
+    hs_limits = np.asarray(hs_limits, dtype=np.float64)
+    return (wave_height[np.newaxis, :, :] < hs_limits[:, np.newaxis, np.newaxis]).sum(axis=2)
+
+
+def load_power_curve(file_path=POWER_CURVE_FILE):
+    """
+    Load the turbine power curve as sorted NumPy arrays
+    :param file_path: Path to the power curve workbook
+    :return: Tuple with the wind speeds (m/s) and the corresponding power (kW)
+    """
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    power_curve = _power_curves.get(key)
+    if power_curve is not None:
+        return power_curve
+
+    df_windpower = pd.read_excel(file_path, usecols=['Wind speed', 'Power']).sort_values('Wind speed')
+    power_curve = (df_windpower['Wind speed'].to_numpy(dtype=np.float64),
+                   df_windpower['Power'].to_numpy(dtype=np.float64))
+    _power_curves[key] = power_curve
+    return power_curve
+
+
+def wind_power(wind_speed, power_curve, interpolate=False):
+    """
+    Look up the turbine power for an array of wind speeds
+    By default the power of the nearest wind speed in the table is returned. Speeds outside of
+    the table take the power of the first or last entry (i.e. zero power above cut-out).
+    :param wind_speed: Array of wind speeds of any shape
+    :param power_curve: Tuple with the wind speeds and power of the power curve
+    :param interpolate: Interpolate linearly between the table entries instead
+    :return: Array with the power (kW), same shape as wind_speed
+    """
+    speeds, power = power_curve
+    wind_speed = np.asarray(wind_speed, dtype=np.float64)
+    if interpolate:
+        return np.interp(wind_speed, speeds, power)
+
+    upper = np.clip(np.searchsorted(speeds, wind_speed), 1, len(speeds) - 1)
+    lower = upper - 1
+    nearest = np.where(wind_speed - speeds[lower] <= speeds[upper] - wind_speed, lower, upper)
+    return power[nearest]
+
+
+def downtime_cost(wind_speed, power_curve, interpolate=False):
+    """
+    Hourly cost of lost production per day, based on the daily mean wind speed
+    :param wind_speed: Array of shape (..., days, 24) with the hourly wind speed, the leading
+                       dimensions can be used to evaluate many years or scenarios at once
+    :param power_curve: Tuple with the wind speeds and power of the power curve
+    :param interpolate: Interpolate the power curve instead of using the nearest entry
+    :return: Array of shape (..., days) with the downtime cost per hour
+    """
+    daily_mean = np.asarray(wind_speed, dtype=np.float64).mean(axis=-1)
+    return ELECTRICITY_PRICE / 1000 * wind_power(daily_mean, power_curve, interpolate)